@@ -0,0 +1,138 @@
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+_MISSING = object()
+
+# LRU limitado por tamanho, com expiração por entrada; seguro entre threads.
+# Quem carrega do banco pega generation(key) antes da leitura e passa para set: se a chave
+# foi invalidada no meio do caminho, o valor lido já está velho e não entra no cache
+class TTLCache:
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.stale_sets = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        # relógio de invalidações; chaves que saem do registro sobem o piso (recusa conservadora)
+        self._clock = 0
+        self._floor = 0
+        self._invalidated: OrderedDict[Hashable, int] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[0] < time.monotonic():
+                if entry is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self, key: Hashable) -> int:
+        with self._lock:
+            return self._clock
+
+    def set(self, key: Hashable, value: Any, generation: int | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation is not None and self._invalidated.get(key, self._floor) > generation:
+                self.stale_sets += 1
+                return
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self._clock += 1
+            self._invalidated[key] = self._clock
+            self._invalidated.move_to_end(key)
+            while len(self._invalidated) > max(self.maxsize, 1):
+                _, evicted = self._invalidated.popitem(last=False)
+                self._floor = max(self._floor, evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_sets": self.stale_sets,
+            "size": len(self),
+            "maxsize": self.maxsize,
+        }
+
+# mesma interface do TTLCache, compartilhada entre workers; valores precisam ser JSON.
+# delete incrementa um contador por chave antes de apagar; set grava, confere o contador e
+# desfaz a própria escrita se houve invalidação desde generation(): sem script, sem WATCH
+class RedisCache:
+    def __init__(self, url: str, namespace: str, ttl_seconds: float, client: Any = None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url)
+        self._client = client
+        self.prefix = f"electrostock:{namespace}:"
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.stale_sets = 0
+
+    def _expiry(self) -> int:
+        return max(1, math.ceil(self.ttl_seconds))
+
+    def _generation_key(self, key: Hashable) -> str:
+        return f"{self.prefix}gen:{key}"
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        raw = self._client.get(f"{self.prefix}{key}")
+        if raw is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return json.loads(raw)
+
+    def generation(self, key: Hashable) -> int:
+        return int(self._client.get(self._generation_key(key)) or 0)
+
+    def set(self, key: Hashable, value: Any, generation: int | None = None) -> None:
+        self._client.set(f"{self.prefix}{key}", json.dumps(value), ex=self._expiry())
+        if generation is not None and self.generation(key) != generation:
+            self.stale_sets += 1
+            self._client.delete(f"{self.prefix}{key}")
+
+    def delete(self, key: Hashable) -> None:
+        gen_key = self._generation_key(key)
+        self._client.incr(gen_key)
+        # o contador precisa durar mais que qualquer leitura em andamento, não para sempre
+        self._client.expire(gen_key, self._expiry() + 60)
+        self._client.delete(f"{self.prefix}{key}")
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(f"{self.prefix}*"):
+            self._client.delete(key)
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "hits": self.hits, "misses": self.misses, "stale_sets": self.stale_sets}
+
+def make_cache(namespace: str, maxsize: int, ttl_seconds: float, redis_url: str | None = None) -> TTLCache | RedisCache:
+    if redis_url:
+        return RedisCache(redis_url, namespace, ttl_seconds)
+    return TTLCache(maxsize, ttl_seconds)
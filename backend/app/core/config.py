@@ -2,11 +2,76 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./electrostock.db"
+    # réplica somente-leitura opcional usada pelas rotas GET (get_read_db)
+    READ_REPLICA_URL: str | None = None
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    # carregamento das coleções grandes (Category.items, Item.order_items, User.orders):
+    # "raise" acusa acesso acidental, "noload" devolve vazio; quem precisar usa selectinload()
+    DB_COLLECTION_LAZY: str = "raise"
+
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 20000
 
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_WORKERS: int = 2
+    BCRYPT_QUEUE_LIMIT: int = 32
+
+    # max-age dos GETs de catálogo; com 0 o cliente sempre revalida via ETag
+    CATALOG_CACHE_MAX_AGE: int = 0
+
+    # cache de leitura de categorias/itens; CACHE_REDIS_URL compartilha entre workers
+    CATALOG_CACHE_SIZE: int = 10000
+    CATALOG_CACHE_TTL_SECONDS: float = 30.0
+    CACHE_REDIS_URL: str | None = None
+
+    # modo de profiling SQL (opt-in): log de queries lentas com EXPLAIN, Server-Timing
+    # e dump de amostragem por requisição com o header "X-Profile: <PROFILE_SECRET>"
+    # (sem PROFILE_SECRET a amostragem fica desligada)
+    SQL_PROFILING_ENABLED: bool = False
+    SLOW_QUERY_MS: float = 200.0
+    PROFILE_SECRET: str | None = None
+    PROFILE_SAMPLE_INTERVAL_MS: float = 1.0
+    PROFILE_DUMP_DIR: str = "./profiles"
+
+    # compressão das respostas (br quando o cliente aceita e o pacote brotli existe, senão gzip)
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # POST /orders com Idempotency-Key: por quanto tempo a resposta original é reaproveitada
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = 60.0
+
+    # snapshots do razão de estoque: atraso em relação ao relógio para não cortar transações em andamento
+    STOCK_SNAPSHOT_LAG_SECONDS: int = 60
+
+    # fila de tarefas pós-commit (outbox): workers por processo (0 desliga), polling, lease e novas tentativas
+    JOB_WORKERS: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_LEASE_SECONDS: float = 300.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 2.0
+    JOB_RETRY_MAX_SECONDS: float = 600.0
+    JOB_METRICS_INTERVAL_SECONDS: float = 15.0
+
+    # eventos em tempo real (SSE): fila por assinante e intervalo do keep-alive
+    EVENT_QUEUE_SIZE: int = 100
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+
+    PRINCIPAL_CACHE_SIZE: int = 4096
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+
     ADMIN_EMAIL: str = "admin@example.com"
     ADMIN_PASSWORD: str = "admin123"
 
@@ -1,13 +1,17 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.principal_cache import Principal, principal_cache
+from app.db.session import SessionLocal, ReadSessionLocal, AsyncSessionLocal
+from app.models.user import User
 from app.services.user_service import get_user_by_email
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
 def get_db():
     db = SessionLocal()
@@ -16,7 +20,19 @@ def get_db():
     finally:
         db.close()
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_read_db():
+    if AsyncSessionLocal is None:
+        db = ReadSessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+        return
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
         email: str | None = payload.get("sub")
@@ -24,13 +40,60 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
             raise HTTPException(status_code=401, detail="Token inválido.")
     except JWTError:
         raise HTTPException(status_code=401, detail="Token inválido.")
+    return payload
+
+def get_token_claims(token: str = Depends(oauth2_scheme)) -> dict:
+    return decode_token(token)
+
+def get_stream_claims(
+    token: str | None = Depends(optional_oauth2_scheme),
+    access_token: str | None = Query(default=None),
+) -> dict:
+    # EventSource e WebSocket do navegador não enviam Authorization: o token pode vir na query
+    token = token or access_token
+    if not token:
+        raise HTTPException(status_code=401, detail="Não autenticado.", headers={"WWW-Authenticate": "Bearer"})
+    return decode_token(token)
 
-    user = get_user_by_email(db, email)
-    if not user:
+def _load_principal(db: Session, claims: dict) -> Principal:
+    email = claims["sub"]
+    principal = principal_cache.get(email)
+    if principal is not None:
+        return principal
+
+    generation = principal_cache.generation(email)
+    uid = claims.get("uid")
+    user = db.get(User, uid) if uid is not None else get_user_by_email(db, email)
+    if not user or user.email != email:
         raise HTTPException(status_code=401, detail="Usuário não encontrado.")
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.set(email, principal, generation)
+    return principal
 
-def require_admin(current_user=Depends(get_current_user)):
+# a Session só abre conexão na primeira query, então um acerto no cache não toca o banco
+def get_current_user(claims: dict = Depends(get_token_claims), db: Session = Depends(get_db)) -> Principal:
+    return _load_principal(db, claims)
+
+def require_admin(claims: dict = Depends(get_token_claims), db: Session = Depends(get_db)) -> Principal:
+    # o papel vale pelo principal (cache ou banco), não pela claim "role" do token: uma promoção ou
+    # rebaixamento invalida o cache e vale já na próxima requisição, sem novo login
+    current_user = _load_principal(db, claims)
     if current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Acesso restrito ao admin.")
     return current_user
+
+def get_stream_user(claims: dict = Depends(get_stream_claims), db: Session = Depends(get_db)) -> Principal:
+    return _load_principal(db, claims)
+
+def require_stream_admin(user: Principal = Depends(get_stream_user)) -> Principal:
+    if user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Acesso restrito ao admin.")
+    return user
+
+def principal_from_claims(claims: dict) -> Principal:
+    # para rotas WebSocket, que não passam pelas dependências com Session
+    db = SessionLocal()
+    try:
+        return _load_principal(db, claims)
+    finally:
+        db.close()
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+class EventBroker:
+    # pub/sub em memória do processo: os serviços publicam (de threads do threadpool)
+    # e cada conexão SSE consome a própria fila no event loop
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def subscribe(self, topic: str) -> Iterator[asyncio.Queue]:
+        entry = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.queue_size))
+        with self._lock:
+            self._subscribers.setdefault(topic, set()).add(entry)
+        try:
+            yield entry[1]
+        finally:
+            with self._lock:
+                subscribers = self._subscribers[topic]
+                subscribers.discard(entry)
+                # tópicos por usuário: não acumular conjuntos vazios
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    def publish(self, topic: str, payload: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, payload)
+            except RuntimeError:
+                # loop já encerrado; a assinatura sai no finally do subscribe
+                pass
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, payload: dict) -> None:
+        # assinante lento não segura quem publica: descarta o evento mais antigo
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(payload)
+
+    def subscriber_count(self, topic: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(topic, ()))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "topics": len(self._subscribers),
+                "subscribers": sum(len(subs) for subs in self._subscribers.values()),
+            }
+
+broker = EventBroker(settings.EVENT_QUEUE_SIZE)
+
+def publish_on_commit(db: Session, topic: str, payload: dict) -> None:
+    # só depois do commit: um rollback não pode anunciar uma mudança que não aconteceu
+    db.info.setdefault("pending_events", []).append((topic, payload))
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    for topic, payload in session.info.pop("pending_events", []):
+        broker.publish(topic, payload)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session: Session, previous_transaction) -> None:
+    session.info.pop("pending_events", None)
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.metrics import bcrypt_queue_wait
+
+# pool dedicado ao bcrypt: limita quantos núcleos o hashing pode ocupar e recusa
+# (503) quando a fila enche. As rotas usam run_async e esperam no event loop, sem
+# ocupar threads do Starlette; run (bloqueante) fica para scripts e serviços síncronos
+class HashingPool:
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_seconds = 0.0
+        self.max_queue_wait_seconds = 0.0
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(503, "Servidor ocupado, tente novamente.", headers={"Retry-After": "1"})
+
+        submitted = time.perf_counter()
+        with self._lock:
+            self.pending += 1
+
+        def task():
+            waited = time.perf_counter() - submitted
+            with self._lock:
+                self.pending -= 1
+                self.active += 1
+                self.queue_wait_seconds += waited
+                self.max_queue_wait_seconds = max(self.max_queue_wait_seconds, waited)
+            bcrypt_queue_wait.observe(waited)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+
+        def done(future: Future):
+            if future.cancelled():
+                # cliente desconectou com o hash ainda na fila: a tarefa nunca rodou
+                with self._lock:
+                    self.pending -= 1
+            self._slots.release()
+
+        try:
+            future = self._executor.submit(task)
+        except BaseException:
+            with self._lock:
+                self.pending -= 1
+            self._slots.release()
+            raise
+        future.add_done_callback(done)
+        return future
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return self._submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "queue_depth": self.pending,
+                "active": self.active,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_wait_seconds_total": self.queue_wait_seconds,
+                "queue_wait_seconds_max": self.max_queue_wait_seconds,
+            }
+
+hashing_pool = HashingPool(settings.BCRYPT_WORKERS, settings.BCRYPT_QUEUE_LIMIT)
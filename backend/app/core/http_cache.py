@@ -0,0 +1,42 @@
+import hashlib
+
+from fastapi import Depends, HTTPException, Request, Response
+
+from app.core.config import settings
+from app.core.deps import get_read_db
+from app.services.version_service import get_stock_version_async, get_version_async
+
+def make_etag(request: Request, *parts) -> str:
+    # a query string entra na chave: filtros e cursores diferentes geram ETags diferentes
+    key = "|".join(str(p) for p in (request.url.path, request.url.query, *parts))
+    return '"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+def cache_headers(etag: str) -> dict[str, str]:
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.CATALOG_CACHE_MAX_AGE}, must-revalidate",
+    }
+
+def catalog_cache(table: str, *, with_stock: bool = False):
+    # responde 304 só com a leitura dos contadores, antes de qualquer consulta ao ORM
+    async def dependency(request: Request, response: Response, db=Depends(get_read_db)) -> str:
+        parts = [table, await get_version_async(db, table)]
+        if with_stock:
+            # no detalhe, só os movimentos do próprio item mudam o ETag
+            item_id = request.path_params.get("item_id")
+            parts.append(await get_stock_version_async(db, int(item_id) if item_id and item_id.isdigit() else None))
+        etag = make_etag(request, *parts)
+        headers = cache_headers(etag)
+        if is_not_modified(request, etag):
+            raise HTTPException(304, headers=headers)
+        response.headers.update(headers)
+        return etag
+    return dependency
@@ -0,0 +1,210 @@
+import asyncio
+import inspect
+import json
+import logging
+import random
+import time
+from typing import Any, Callable
+
+from sqlalchemy import case, delete, event, func, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.db.session import SessionLocal
+from app.models.outbox import OutboxJob
+
+# fila de tarefas pós-commit: quem muda um pedido grava a tarefa em outbox_jobs na mesma transação
+# (ou as duas coisas ficam gravadas, ou nenhuma) e responde logo após o commit; os workers do
+# processo executam a tarefa depois. Entrega "pelo menos uma vez": os handlers devem ser idempotentes.
+
+logger = logging.getLogger("electrostock.jobs")
+
+jobs_total = registry.counter("jobs_total", "Tarefas executadas por tópico e resultado (ok, retry, dead).")
+job_lag = registry.histogram("job_queue_lag_seconds", "Tempo entre o enfileiramento e o início da primeira execução.")
+job_duration = registry.histogram("job_duration_seconds", "Duração da execução das tarefas por tópico.")
+job_queue_depth = registry.gauge("job_queue_depth", "Tarefas na fila por estado (ready, scheduled, dead).")
+job_queue_oldest = registry.gauge("job_queue_oldest_seconds", "Idade da tarefa pendente mais antiga.")
+
+_handlers: dict[str, Callable[[dict], Any]] = {}
+
+def job_handler(topic: str):
+    def register(fn: Callable[[dict], Any]) -> Callable[[dict], Any]:
+        _handlers[topic] = fn
+        return fn
+    return register
+
+def enqueue(db: Session, topic: str, payload: dict) -> None:
+    now = time.time()
+    db.add(OutboxJob(topic=topic, payload=json.dumps(payload), status="pending", attempts=0, available_at=now, created_at=now))
+    db.info["jobs_enqueued"] = True
+
+@event.listens_for(Session, "after_commit")
+def _wake_workers(session: Session) -> None:
+    if session.info.pop("jobs_enqueued", False):
+        job_workers.notify()
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_wake(session: Session, previous_transaction) -> None:
+    session.info.pop("jobs_enqueued", None)
+
+def claim_job():
+    now = time.time()
+    # um único UPDATE escolhe e reserva a tarefa: dois workers (ou processos) nunca pegam a mesma;
+    # no Postgres o SKIP LOCKED evita que esperem um pelo outro
+    ready = (
+        select(OutboxJob.id)
+        .where(OutboxJob.status == "pending", OutboxJob.available_at <= now)
+        .order_by(OutboxJob.available_at, OutboxJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    with SessionLocal() as db:
+        job = db.execute(
+            update(OutboxJob)
+            .where(OutboxJob.id == ready)
+            .values(available_at=now + settings.JOB_LEASE_SECONDS, attempts=OutboxJob.attempts + 1)
+            .returning(OutboxJob.id, OutboxJob.topic, OutboxJob.payload, OutboxJob.attempts, OutboxJob.created_at)
+            .execution_options(synchronize_session=False)
+        ).first()
+        db.commit()
+    return job
+
+def complete_job(job_id: int) -> None:
+    with SessionLocal() as db:
+        db.execute(delete(OutboxJob).where(OutboxJob.id == job_id))
+        db.commit()
+
+def retry_delay(attempts: int) -> float:
+    # backoff exponencial com jitter: falhas simultâneas não voltam todas no mesmo instante
+    delay = min(settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.JOB_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+def fail_job(job_id: int, attempts: int, error: str, dead: bool) -> None:
+    values = {"last_error": error[:2000]}
+    if dead:
+        values["status"] = "dead"
+    else:
+        values["available_at"] = time.time() + retry_delay(attempts)
+    with SessionLocal() as db:
+        db.execute(update(OutboxJob).where(OutboxJob.id == job_id).values(**values))
+        db.commit()
+
+def queue_stats() -> dict:
+    now = time.time()
+    pending = OutboxJob.status == "pending"
+    with SessionLocal() as db:
+        ready, scheduled, dead, oldest = db.execute(
+            select(
+                func.count(case((pending & (OutboxJob.available_at <= now), 1))),
+                func.count(case((pending & (OutboxJob.available_at > now), 1))),
+                func.count(case((OutboxJob.status == "dead", 1))),
+                func.min(case((pending, OutboxJob.created_at))),
+            )
+        ).one()
+    return {
+        "ready": ready,
+        "scheduled": scheduled,
+        "dead": dead,
+        "oldest_seconds": now - oldest if oldest is not None else 0.0,
+        "workers": job_workers.workers,
+    }
+
+class JobWorkerPool:
+    # workers assíncronos no event loop da aplicação; o acesso ao banco e os handlers
+    # síncronos vão para o threadpool
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self._stopped: asyncio.Event | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        if self.workers <= 0 or self._tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._stopped = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._report()))
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        if not self._tasks:
+            return
+        self._stopped.set()
+        self._wake.set()
+        # a tarefa em execução termina; se passar do prazo é cancelada e volta à fila ao fim do lease
+        _, running = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    def notify(self) -> None:
+        # chamado de qualquer thread (after_commit): acorda os workers sem esperar o polling
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            pass
+
+    async def _work(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.clear()
+            try:
+                job = await run_in_threadpool(claim_job)
+                if job is not None:
+                    await self._execute(job)
+                    continue
+            except Exception:
+                logger.exception("Falha no worker da fila de tarefas.")
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.JOB_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _execute(self, job) -> None:
+        if job.attempts == 1:
+            job_lag.observe(max(time.time() - job.created_at, 0.0))
+        handler = _handlers.get(job.topic)
+        start = time.perf_counter()
+        try:
+            if handler is None:
+                raise LookupError(f"Nenhum handler para o tópico '{job.topic}'.")
+            payload = json.loads(job.payload)
+            if inspect.iscoroutinefunction(handler):
+                await handler(payload)
+            else:
+                await run_in_threadpool(handler, payload)
+        except Exception as e:
+            dead = handler is None or job.attempts >= settings.JOB_MAX_ATTEMPTS
+            logger.warning("Tarefa %s (%s) falhou na tentativa %s: %r", job.id, job.topic, job.attempts, e)
+            await run_in_threadpool(fail_job, job.id, job.attempts, repr(e), dead)
+            jobs_total.inc(topic=job.topic, outcome="dead" if dead else "retry")
+        else:
+            await run_in_threadpool(complete_job, job.id)
+            jobs_total.inc(topic=job.topic, outcome="ok")
+        finally:
+            job_duration.observe(time.perf_counter() - start, topic=job.topic)
+
+    async def _report(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                stats = await run_in_threadpool(queue_stats)
+                for state in ("ready", "scheduled", "dead"):
+                    job_queue_depth.set(stats[state], state=state)
+                job_queue_oldest.set(stats["oldest_seconds"])
+            except Exception:
+                logger.exception("Falha ao medir a fila de tarefas.")
+            try:
+                await asyncio.wait_for(self._stopped.wait(), settings.JOB_METRICS_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+job_workers = JobWorkerPool(settings.JOB_WORKERS)
@@ -0,0 +1,187 @@
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# registro mínimo no formato de exposição do Prometheus (text/plain 0.0.4), sem dependências
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        # por conjunto de labels: [contagem por bucket..., soma, total]
+        self._values: dict[tuple, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            if idx < len(self.buckets):
+                data[idx] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    def samples(self):
+        out = []
+        with self._lock:
+            items = [(key, list(data)) for key, data in self._values.items()]
+        for key, data in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, data):
+                cumulative += count
+                out.append((f"{self.name}_bucket", key + (("le", repr(float(bound))),), cumulative))
+            out.append((f"{self.name}_bucket", key + (("le", "+Inf"),), data[-1]))
+            out.append((f"{self.name}_sum", key, data[-2]))
+            out.append((f"{self.name}_count", key, data[-1]))
+        return out
+
+class Registry:
+    def __init__(self):
+        self._metrics: list = []
+        self._collectors: list = []
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._add(Counter(name, help))
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        return self._add(Gauge(name, help))
+
+    def histogram(self, name: str, help: str, buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, buckets))
+
+    def collector(self, fn):
+        # chamado a cada coleta, para métricas lidas de outros componentes (pools, caches)
+        self._collectors.append(fn)
+        return fn
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        for fn in self._collectors:
+            fn()
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+http_requests = registry.counter("http_requests_total", "Requisições HTTP por rota, método e status.")
+http_latency = registry.histogram("http_request_duration_seconds", "Latência das requisições HTTP por rota.")
+http_in_flight = registry.gauge("http_requests_in_flight", "Requisições HTTP em andamento.")
+sql_statements = registry.counter("sql_statements_total", "Statements SQL executados.")
+sql_seconds = registry.counter("sql_seconds_total", "Tempo total gasto em statements SQL.")
+sql_per_request = registry.histogram("http_request_sql_statements", "Statements SQL por requisição.", COUNT_BUCKETS)
+sql_time_per_request = registry.histogram("http_request_sql_seconds", "Tempo de SQL por requisição.")
+threadpool_in_use = registry.gauge("threadpool_workers_in_use", "Threads do pool do Starlette ocupadas.")
+threadpool_capacity = registry.gauge("threadpool_workers_total", "Capacidade do pool de threads do Starlette.")
+bcrypt_queue_wait = registry.histogram("bcrypt_queue_wait_seconds", "Tempo de espera na fila do bcrypt.")
+
+# estatísticas de SQL da requisição corrente; o contexto é copiado para o threadpool,
+# então rotas síncronas acumulam no mesmo dict
+_request_sql: ContextVar[dict | None] = ContextVar("request_sql", default=None)
+
+def instrument_engine(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        sql_statements.inc()
+        sql_seconds.inc(elapsed)
+        stats = _request_sql.get()
+        if stats is not None:
+            stats["count"] += 1
+            stats["seconds"] += elapsed
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        stats = {"count": 0, "seconds": 0.0}
+        token = _request_sql.set(stats)
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_in_flight.dec()
+            _request_sql.reset(token)
+            route = scope.get("route")
+            # o template da rota ("/items/{item_id}") evita uma série por id
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_requests.inc(route=path, method=method, status=str(status["code"]))
+            http_latency.observe(elapsed, route=path, method=method)
+            sql_per_request.observe(stats["count"], route=path, method=method)
+            sql_time_per_request.observe(stats["seconds"], route=path, method=method)
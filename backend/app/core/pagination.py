@@ -0,0 +1,41 @@
+import base64
+import binascii
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Query, Response
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, _, value = raw.partition(":")
+        if prefix != "id":
+            raise ValueError
+        return int(value)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(400, "Cursor inválido.")
+
+@dataclass
+class Page:
+    after_id: int | None
+    limit: int
+
+def page_params(
+    after_id: int | None = Query(default=None, ge=0),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> Page:
+    if cursor is not None:
+        after_id = decode_cursor(cursor)
+    return Page(after_id=after_id, limit=limit)
+
+def set_next_cursor(response: Response, rows: list, page: Page) -> None:
+    # página cheia => pode haver mais registros depois do último id
+    if len(rows) == page.limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].id)
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    name: str
+    email: str
+    role: str
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(id=user.id, name=user.name, email=user.email, role=user.role)
+
+# chave: "sub" do token (email do usuário)
+principal_cache = TTLCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+def invalidate_principal(email: str) -> None:
+    principal_cache.delete(email)
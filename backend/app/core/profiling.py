@@ -0,0 +1,190 @@
+import asyncio
+import contextvars
+import hmac
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger("electrostock.sql")
+
+# perfil SQL da requisição corrente: lista de (função de serviço, statement, segundos)
+_request_queries: ContextVar[list | None] = ContextVar("request_queries", default=None)
+# função de serviço informada explicitamente (leituras async, onde a pilha não a contém)
+query_origin: ContextVar[str | None] = ContextVar("query_origin", default=None)
+
+# amostrador da requisição com X-Profile: marca o contexto dela (e o das threads que herdam esse contexto)
+_active_sampler: ContextVar["StackSampler | None"] = ContextVar("active_sampler", default=None)
+
+SERVICE_PREFIX = "app.services."
+
+def caller_name(frame) -> str:
+    module = frame.f_globals.get("__name__", "")
+    return f"{module.rsplit('.', 1)[-1]}.{frame.f_code.co_name}"
+
+def _service_function() -> str:
+    frame = sys._getframe(2)
+    first_app_frame = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(SERVICE_PREFIX):
+            return caller_name(frame)
+        if first_app_frame is None and module.startswith("app.") and module != __name__:
+            first_app_frame = frame
+        frame = frame.f_back
+    if query_origin.get():
+        return query_origin.get()
+    return caller_name(first_app_frame) if first_app_frame is not None else "?"
+
+def _explain(conn, statement: str, parameters) -> str:
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return "\n".join(" ".join(str(col) for col in row) for row in cursor.fetchall())
+    except Exception as e:
+        return f"(EXPLAIN falhou: {e})"
+    finally:
+        cursor.close()
+
+def install_profiling(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profile_start", []).append((time.perf_counter(), _service_function()))
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started, function = conn.info["profile_start"].pop()
+        elapsed = time.perf_counter() - started
+        queries = _request_queries.get()
+        if queries is not None:
+            queries.append((function, statement, elapsed))
+        if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            plan = "" if executemany else _explain(conn, statement, parameters)
+            logger.warning(
+                "slow query %.1fms em %s\n%s\nparams=%r\nplano:\n%s",
+                elapsed * 1000, function, statement, parameters, plan,
+            )
+
+class StackSampler:
+    # amostrador de pilhas só da requisição que pediu o perfil, no formato "folded" usado por
+    # flamegraph.pl/speedscope: no event loop conta só enquanto a task da requisição está rodando;
+    # nas threads do threadpool, só o trabalho que roda com o contexto dela
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._task: asyncio.Task | None = None
+        self._token = None
+
+    def _belongs_to_request(self, ident: int, frame) -> bool:
+        if ident == self._loop_thread:
+            return asyncio.current_task(self._loop) is self._task
+        # o worker do threadpool roda a função com context.run(...): o Context copiado da
+        # requisição é uma variável local de algum frame da pilha dessa thread
+        while frame is not None:
+            for value in frame.f_locals.values():
+                if isinstance(value, contextvars.Context):
+                    return value.get(_active_sampler) is self
+            frame = frame.f_back
+        return False
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if not self._belongs_to_request(ident, frame):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(caller_name(frame))
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        # chamado na task da requisição
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._task = asyncio.current_task()
+        self._token = _active_sampler.set(self)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        _active_sampler.reset(self._token)
+
+    def dump(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+def profile_requested(headers: dict) -> bool:
+    # amostragem custa uma thread e um arquivo por requisição: só com o segredo configurado
+    # (PROFILE_SECRET) e enviado em "X-Profile"; sem segredo o header é ignorado
+    secret = settings.PROFILE_SECRET
+    value = headers.get(b"x-profile")
+    return bool(secret) and value is not None and hmac.compare_digest(value, secret.encode())
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries: list = []
+        token = _request_queries.set(queries)
+        start = time.perf_counter()
+        headers = dict(scope["headers"])
+        sampler = StackSampler(settings.PROFILE_SAMPLE_INTERVAL_MS / 1000) if profile_requested(headers) else None
+        dump_name = None
+        if sampler:
+            dump_name = f"{int(time.time() * 1000)}-{scope['method']}-{scope['path'].strip('/').replace('/', '_') or 'root'}.folded"
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                sql_ms = sum(q[2] for q in queries) * 1000
+                total_ms = (time.perf_counter() - start) * 1000
+                timing = f'sql;dur={sql_ms:.2f};desc="{len(queries)} queries", app;dur={total_ms:.2f}'
+                extra = [(b"server-timing", timing.encode())]
+                if dump_name:
+                    extra.append((b"x-profile-dump", dump_name.encode()))
+                message = {**message, "headers": list(message.get("headers", [])) + extra}
+            await send(message)
+
+        try:
+            if sampler:
+                with sampler:
+                    await self.app(scope, receive, send_wrapper)
+                os.makedirs(settings.PROFILE_DUMP_DIR, exist_ok=True)
+                sampler.dump(os.path.join(settings.PROFILE_DUMP_DIR, dump_name))
+            else:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_queries.reset(token)
+            if queries:
+                by_function = Counter()
+                for function, _statement, elapsed in queries:
+                    by_function[function] += elapsed
+                logger.info(
+                    "%s %s: %d queries, %.1fms SQL [%s]",
+                    scope["method"], scope["path"], len(queries), sum(q[2] for q in queries) * 1000,
+                    ", ".join(f"{fn}={secs * 1000:.1f}ms" for fn, secs in by_function.most_common()),
+                )
@@ -2,21 +2,46 @@ from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
 from jose import jwt
 from app.core.config import settings
+from app.core.hashing import hashing_pool
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min/max iguais ao custo configurado: hashes com outro custo são marcados para rehash
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
-def hash_password(password: str) -> str:
+def _truncate(password: str) -> str:
     pw_bytes = password.encode("utf-8")
     if len(pw_bytes) > 72:
         pw_bytes = pw_bytes[:72]
         password = pw_bytes.decode("utf-8", errors="ignore")
-    return pwd_context.hash(password)
+    return password
+
+def hash_password(password: str) -> str:
+    return hashing_pool.run(pwd_context.hash, _truncate(password))
+
+async def hash_password_async(password: str) -> str:
+    return await hashing_pool.run_async(pwd_context.hash, _truncate(password))
 
 
 def verify_password(password: str, hashed: str) -> bool:
-    return pwd_context.verify(password, hashed)
+    return hashing_pool.run(pwd_context.verify, password, hashed)
+
+def verify_and_update_password(password: str, hashed: str) -> tuple[bool, str | None]:
+    # devolve um novo hash quando o custo do bcrypt mudou desde que a senha foi gravada
+    return hashing_pool.run(pwd_context.verify_and_update, password, hashed)
+
+async def verify_and_update_password_async(password: str, hashed: str) -> tuple[bool, str | None]:
+    return await hashing_pool.run_async(pwd_context.verify_and_update, password, hashed)
 
-def create_access_token(subject: str) -> str:
+def create_access_token(subject: str, *, user_id: int | None = None, role: str | None = None) -> str:
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     payload = {"sub": subject, "exp": expire}
+    if user_id is not None:
+        payload["uid"] = user_id
+    if role is not None:
+        payload["role"] = role
     return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
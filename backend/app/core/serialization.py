@@ -0,0 +1,40 @@
+import json
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Iterable
+
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # opcional: sem o pacote usa o json da stdlib
+    orjson = None
+
+DefaultJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+@lru_cache
+def _getter(schema: type[BaseModel]) -> tuple[tuple[str, ...], attrgetter]:
+    fields = tuple(schema.model_fields)
+    return fields, attrgetter(*fields)
+
+def rows_to_dicts(rows: Iterable[Any], schema: type[BaseModel]) -> list[dict]:
+    # linhas do ORM já respeitam o schema (tipos e NOT NULL vêm do banco): lê só os campos
+    # de saída, sem a validação e o jsonable_encoder que o response_model faria linha a linha
+    fields, getter = _getter(schema)
+    if len(fields) == 1:
+        return [{fields[0]: getter(row)} for row in rows]
+    return [dict(zip(fields, getter(row))) for row in rows]
+
+def json_response(content: Any, response: Response | None = None) -> Response:
+    # devolver um Response direto descarta os headers do parâmetro "response" (cursor, ETag): copia aqui
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return Response(dumps(content), media_type="application/json", headers=headers)
@@ -0,0 +1,36 @@
+import asyncio
+import json
+import time
+from typing import AsyncIterator
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.events import broker
+
+def format_event(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+async def _stream(request: Request, topic: str, expires_at: float | None) -> AsyncIterator[str]:
+    with broker.subscribe(topic) as queue:
+        # "retry" diz ao EventSource quanto esperar antes de reconectar
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            if expires_at is not None and time.time() >= expires_at:
+                # token vencido: encerra; a reconexão passa de novo pela autenticação
+                return
+            try:
+                payload = await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # comentário SSE: mantém a conexão viva através de proxies
+                yield ": ping\n\n"
+                continue
+            yield format_event(payload["type"], payload)
+
+def sse_response(request: Request, topic: str, expires_at: float | None = None) -> StreamingResponse:
+    return StreamingResponse(
+        _stream(request, topic, expires_at),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+from fastapi import WebSocket
+from starlette.websockets import WebSocketDisconnect
+
+from app.core.config import settings
+from app.core.events import broker
+
+# mesmo feed do SSE (app.core.sse) sobre WebSocket: cada evento do tópico vira uma mensagem JSON
+
+async def _until_disconnect(websocket: WebSocket) -> None:
+    # o cliente não envia nada útil; receber é o jeito de perceber que a conexão caiu
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+async def websocket_feed(websocket: WebSocket, topic: str, expires_at: float | None = None) -> None:
+    with broker.subscribe(topic) as queue:
+        await websocket.accept()
+        disconnected = asyncio.create_task(_until_disconnect(websocket))
+        try:
+            while not disconnected.done():
+                if expires_at is not None and time.time() >= expires_at:
+                    # token vencido: o cliente reconecta com um novo
+                    await websocket.close(code=4401)
+                    return
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {getter, disconnected}, timeout=settings.SSE_HEARTBEAT_SECONDS, return_when=asyncio.FIRST_COMPLETED
+                )
+                if getter in done:
+                    await websocket.send_json(getter.result())
+                    continue
+                getter.cancel()
+                if not disconnected.done():
+                    await websocket.send_json({"type": "ping"})
+        except WebSocketDisconnect:
+            pass
+        finally:
+            disconnected.cancel()
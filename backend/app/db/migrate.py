@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.engine import Engine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+def alembic_config(url: str | None = None) -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    if url:
+        config.attributes["url"] = url
+    return config
+
+def upgrade_to_head(url: str | None = None) -> None:
+    command.upgrade(alembic_config(url), "head")
+
+def ensure_schema_current(engine: Engine) -> None:
+    # a aplicação não faz DDL: só confere se o banco está na última migração
+    head = ScriptDirectory.from_config(alembic_config()).get_current_head()
+    with engine.connect() as conn:
+        current = MigrationContext.configure(conn).get_current_revision()
+    if current != head:
+        raise RuntimeError(
+            f"Banco na migração {current or 'nenhuma'}, esperado {head}. Rode 'alembic upgrade head' na pasta backend."
+        )
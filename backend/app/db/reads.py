@@ -0,0 +1,61 @@
+import sys
+from contextvars import Token
+from typing import Any
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.profiling import caller_name, query_origin
+
+# leituras usadas pelas rotas async: com AsyncSession vão direto ao driver assíncrono;
+# com a Session síncrona (DATABASE_URL sem driver async) rodam no threadpool
+
+def _mark_origin() -> Token | None:
+    # a função de serviço async não aparece na pilha de quem executa a query
+    if settings.SQL_PROFILING_ENABLED:
+        return query_origin.set(caller_name(sys._getframe(2)))
+    return None
+
+def _clear_origin(token: Token | None) -> None:
+    # sem o reset, a origem ficaria valendo para as próximas queries da mesma requisição
+    if token is not None:
+        query_origin.reset(token)
+
+async def fetch_all(db: AsyncSession | Session, stmt: Select) -> list[Any]:
+    token = _mark_origin()
+    try:
+        if isinstance(db, AsyncSession):
+            return list((await db.scalars(stmt)).all())
+        return await run_in_threadpool(lambda: list(db.scalars(stmt)))
+    finally:
+        _clear_origin(token)
+
+async def fetch_rows(db: AsyncSession | Session, stmt: Select) -> list[Any]:
+    token = _mark_origin()
+    try:
+        if isinstance(db, AsyncSession):
+            return list((await db.execute(stmt)).all())
+        return await run_in_threadpool(lambda: list(db.execute(stmt)))
+    finally:
+        _clear_origin(token)
+
+async def fetch_by_id(db: AsyncSession | Session, model: type, pk: Any, **kwargs: Any) -> Any:
+    token = _mark_origin()
+    try:
+        if isinstance(db, AsyncSession):
+            return await db.get(model, pk, **kwargs)
+        return await run_in_threadpool(lambda: db.get(model, pk, **kwargs))
+    finally:
+        _clear_origin(token)
+
+async def fetch_scalar(db: AsyncSession | Session, stmt: Select) -> Any:
+    token = _mark_origin()
+    try:
+        if isinstance(db, AsyncSession):
+            return await db.scalar(stmt)
+        return await run_in_threadpool(lambda: db.scalar(stmt))
+    finally:
+        _clear_origin(token)
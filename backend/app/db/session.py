@@ -1,8 +1,108 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.core.profiling import install_profiling
 
-connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+# drivers assíncronos aceitos em DATABASE_URL -> driver síncrono usado pelas rotas de escrita
+ASYNC_DRIVERS = {
+    "sqlite+aiosqlite": "sqlite",
+    "postgresql+asyncpg": "postgresql",
+}
 
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args, future=True)
+def to_sync_url(url: URL) -> URL:
+    if url.drivername in ASYNC_DRIVERS:
+        return url.set(drivername=ASYNC_DRIVERS[url.drivername])
+    return url
+
+def to_async_url(url: URL) -> URL:
+    # READ_REPLICA_URL pode vir com driver síncrono (sqlite:///...) mesmo com DATABASE_URL async
+    if url.drivername in ASYNC_DRIVERS:
+        return url
+    for async_driver, sync_driver in ASYNC_DRIVERS.items():
+        if url.get_backend_name() == sync_driver:
+            return url.set(drivername=async_driver)
+    raise ValueError(f"Sem driver assíncrono para {url.drivername}; use um de {', '.join(ASYNC_DRIVERS)}.")
+
+def _is_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite"
+
+def _is_sqlite_memory(url: URL) -> bool:
+    return _is_sqlite(url) and url.database in (None, "", ":memory:")
+
+def _engine_kwargs(url: URL) -> dict:
+    kwargs: dict = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if _is_sqlite(url):
+        if url.drivername == "sqlite":
+            kwargs["connect_args"] = {"check_same_thread": False}
+        if _is_sqlite_memory(url):
+            # banco em memória usa SingletonThreadPool, que não aceita dimensionamento
+            return kwargs
+    else:
+        kwargs["pool_recycle"] = settings.DB_POOL_RECYCLE
+    kwargs.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return kwargs
+
+def _install_sqlite_pragmas(engine: Engine, *, read_only: bool = False) -> None:
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # WAL: leitores não bloqueiam o escritor; busy_timeout espera o lock em vez de
+        # falhar com "database is locked"
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+def make_engine(url: str | URL, *, read_only: bool = False) -> Engine:
+    url = to_sync_url(make_url(url))
+    engine = create_engine(url, future=True, **_engine_kwargs(url))
+    if _is_sqlite(url):
+        _install_sqlite_pragmas(engine, read_only=read_only)
+    instrument_engine(engine)
+    if settings.SQL_PROFILING_ENABLED:
+        install_profiling(engine)
+    return engine
+
+def make_async_engine(url: str | URL, *, read_only: bool = False):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    url = to_async_url(make_url(url))
+    kwargs = _engine_kwargs(url)
+    if _is_sqlite(url) and not _is_sqlite_memory(url):
+        # o aiosqlite usa NullPool por padrão (uma conexão nova por sessão)
+        kwargs["poolclass"] = AsyncAdaptedQueuePool
+    engine = create_async_engine(url, **kwargs)
+    if _is_sqlite(url):
+        _install_sqlite_pragmas(engine.sync_engine, read_only=read_only)
+    instrument_engine(engine.sync_engine)
+    if settings.SQL_PROFILING_ENABLED:
+        install_profiling(engine.sync_engine)
+    return engine
+
+database_url = make_url(settings.DATABASE_URL)
+read_database_url = make_url(settings.READ_REPLICA_URL) if settings.READ_REPLICA_URL else None
+is_async = database_url.drivername in ASYNC_DRIVERS
+
+engine = make_engine(database_url)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+read_engine = make_engine(read_database_url, read_only=True) if read_database_url else engine
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False, future=True)
+
+async_engine = None
+AsyncSessionLocal = None
+if is_async:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    async_engine = make_async_engine(read_database_url or database_url, read_only=read_database_url is not None)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
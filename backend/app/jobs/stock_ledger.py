@@ -0,0 +1,41 @@
+import argparse
+import sys
+
+from app.db.migrate import ensure_schema_current
+from app.db.session import SessionLocal, engine
+from app.main import app  # noqa: F401  (registra modelos)
+from app.services.ledger_service import reconcile, take_snapshot
+
+# tarefas periódicas do razão de estoque (cron/systemd timer):
+#   python -m app.jobs.stock_ledger snapshot
+#   python -m app.jobs.stock_ledger reconcile [--deep]   (sai com código 1 se houver divergência)
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshots e conciliação do razão de estoque.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("snapshot", help="grava o estoque de todos os itens calculado pelo razão")
+    rec = sub.add_parser("reconcile", help="confere items.stock contra o razão, em lotes")
+    rec.add_argument("--batch-size", type=int, default=1000)
+    rec.add_argument("--deep", action="store_true", help="confere também a soma de todos os deltas")
+    args = parser.parse_args()
+
+    ensure_schema_current(engine)
+    db = SessionLocal()
+    try:
+        if args.command == "snapshot":
+            taken_at, rows = take_snapshot(db)
+            print(f"snapshot {taken_at}: {rows} itens")
+            return
+
+        mismatches = 0
+        for mismatch in reconcile(db, batch_size=args.batch_size, deep=args.deep):
+            mismatches += 1
+            print(mismatch)
+        print(f"{mismatches} divergência(s)")
+        if mismatches:
+            sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
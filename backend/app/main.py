@@ -3,19 +3,33 @@ from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 
 from app.db.session import engine, SessionLocal
-from app.db.base import Base
+from app.db.migrate import ensure_schema_current
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.serialization import DefaultJSONResponse
+from app.core.compression import CompressionMiddleware
+from app.core.jobs import job_workers
+from app.core.metrics import MetricsMiddleware
+from app.core.profiling import ProfilingMiddleware
 
 from app.models.user import User
 from app.models.category import Category
 from app.models.item import Item
 from app.models.order import Order
 from app.models.order_item import OrderItem
+from app.models.table_version import TableVersion
+from app.models.order_summary import OrderStatusCount, ItemOrderStat
+from app.models.idempotency_key import IdempotencyKey
+from app.models.stock_ledger import StockMovement, StockSnapshot
+from app.models.outbox import OutboxJob
 
 from app.core.security import hash_password
 from app.services.user_service import get_user_by_email, create_user
 from app.services.category_service import create_category
 from app.services.item_service import create_item
+from app.services.search_service import detect_search_index
+from app.services.version_service import ensure_versions
+from app.services.idempotency_service import REPLAYED_HEADER
 
 from app.routers.auth import router as auth_router
 from app.routers.users import router as users_router
@@ -23,9 +37,12 @@ from app.routers.categories import router as categories_router
 from app.routers.items import router as items_router
 from app.routers.orders import router as orders_router
 from app.routers.order_items import router as order_items_router
+from app.routers.exports import router as exports_router
+from app.routers.monitoring import router as monitoring_router
+from app.routers.reports import router as reports_router
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="ElectroStock API", version="1.0.0")
+    app = FastAPI(title="ElectroStock API", version="1.0.0", default_response_class=DefaultJSONResponse)
 
     app.add_middleware(
         CORSMiddleware,
@@ -33,25 +50,41 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, REPLAYED_HEADER],
     )
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+    app.add_middleware(MetricsMiddleware)
+    if settings.SQL_PROFILING_ENABLED:
+        app.add_middleware(ProfilingMiddleware)
 
     @app.get("/")
     def root():
         return {"message": "API do ElectroStock rodando"}
 
-    Base.metadata.create_all(bind=engine)
-
     app.include_router(auth_router)
     app.include_router(users_router)
     app.include_router(categories_router)
     app.include_router(items_router)
     app.include_router(orders_router)
     app.include_router(order_items_router)
+    app.include_router(exports_router)
+    app.include_router(monitoring_router)
+    app.include_router(reports_router)
 
     @app.on_event("startup")
     def seed():
+        ensure_schema_current(engine)
+        detect_search_index(engine)
+
         db: Session = SessionLocal()
         try:
+            ensure_versions(db)
+
             admin = get_user_by_email(db, settings.ADMIN_EMAIL)
             if not admin:
                 create_user(
@@ -77,6 +110,14 @@ def create_app() -> FastAPI:
         finally:
             db.close()
 
+    @app.on_event("startup")
+    async def start_job_workers():
+        job_workers.start()
+
+    @app.on_event("shutdown")
+    async def stop_job_workers():
+        await job_workers.stop()
+
     return app
 
 app = create_app()
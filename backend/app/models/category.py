@@ -1,5 +1,6 @@
 from sqlalchemy import String, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.core.config import settings
 from app.db.base import Base
 
 class Category(Base):
@@ -8,4 +9,4 @@ class Category(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(120), unique=True, nullable=False)
 
-    items = relationship("Item", back_populates="category")
+    items = relationship("Item", back_populates="category", lazy=settings.DB_COLLECTION_LAZY, passive_deletes=True)
@@ -0,0 +1,19 @@
+from sqlalchemy import String, Integer, Text, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+# resposta original de um POST repetido pelo cliente com o mesmo Idempotency-Key (por usuário)
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # sha256 do corpo: a mesma chave com outro pedido é erro do cliente, não repetição
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    response: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # epoch em segundos; base da expiração (IDEMPOTENCY_TTL_SECONDS)
+    created_at: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
@@ -1,5 +1,6 @@
-from sqlalchemy import String, Integer, ForeignKey, Text
+from sqlalchemy import String, Integer, ForeignKey, Text, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.core.config import settings
 from app.db.base import Base
 
 class Item(Base):
@@ -9,8 +10,22 @@ class Item(Base):
     name: Mapped[str] = mapped_column(String(160), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     stock: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # estoque igual ou abaixo do limite => item entra na fila de reposição
+    reorder_threshold: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"), nullable=False)
     category = relationship("Category", back_populates="items")
 
-    order_items = relationship("OrderItem", back_populates="item")
+    order_items = relationship("OrderItem", back_populates="item", lazy=settings.DB_COLLECTION_LAZY, passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_items_category_id_id", "category_id", "id"),
+        Index("ix_items_stock", "stock"),
+        # índice parcial: contém só os itens em falta e o banco o mantém a cada UPDATE de estoque
+        Index(
+            "ix_items_low_stock",
+            "id",
+            sqlite_where=text("stock <= reorder_threshold"),
+            postgresql_where=text("stock <= reorder_threshold"),
+        ),
+    )
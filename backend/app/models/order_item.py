@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, ForeignKey
+from sqlalchemy import Integer, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
@@ -13,3 +13,8 @@ class OrderItem(Base):
 
     order = relationship("Order", back_populates="items")
     item = relationship("Item", back_populates="order_items")
+
+    __table_args__ = (
+        Index("ix_order_items_order_id_id", "order_id", "id"),
+        Index("ix_order_items_item_id_id", "item_id", "id"),
+    )
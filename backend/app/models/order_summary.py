@@ -0,0 +1,24 @@
+from sqlalchemy import String, Integer, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+# contadores mantidos na mesma transação das escritas de pedidos (summary_service); base dos relatórios
+class OrderStatusCount(Base):
+    __tablename__ = "order_status_counts"
+
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+class ItemOrderStat(Base):
+    __tablename__ = "item_order_stats"
+
+    # sem FK: itens sem linhas de pedido podem ser removidos mesmo com uma linha zerada aqui
+    item_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # soma das quantidades em linhas de pedidos existentes (qualquer status)
+    requested: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # parte que saiu do estoque: pedidos não rejeitados
+    consumed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_item_order_stats_requested", "requested"),
+    )
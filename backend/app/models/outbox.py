@@ -0,0 +1,22 @@
+from sqlalchemy import String, Integer, Float, Text, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+# fila de tarefas pós-commit (app.core.jobs): gravada na mesma transação da mudança que a originou,
+# consumida pelos workers do processo; linhas concluídas são apagadas, as que esgotam as tentativas ficam como "dead"
+class OutboxJob(Base):
+    __tablename__ = "outbox_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    topic: Mapped[str] = mapped_column(String(50), nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(String(10), nullable=False, default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # epoch em segundos; ao ser pega por um worker avança JOB_LEASE_SECONDS (se o processo morrer, volta para a fila)
+    available_at: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[float] = mapped_column(Float, nullable=False)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_outbox_jobs_ready", "status", "available_at"),
+    )
@@ -0,0 +1,35 @@
+from sqlalchemy import String, Integer, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+# razão-diário do estoque: uma linha por mudança em items.stock, gravada na mesma transação (ledger_service).
+# só recebe INSERTs; items.stock continua sendo o saldo corrente e é conferido contra o razão (reconcile)
+class StockMovement(Base):
+    __tablename__ = "stock_movements"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # sem FK: o histórico de um item removido continua auditável
+    item_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    delta: Mapped[int] = mapped_column(Integer, nullable=False)
+    # saldo logo depois do movimento: o estoque em uma data é o stock_after do último movimento até ela
+    stock_after: Mapped[int] = mapped_column(Integer, nullable=False)
+    reason: Mapped[str] = mapped_column(String(20), nullable=False)
+    order_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # epoch em segundos
+    created_at: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_stock_movements_item_created", "item_id", "created_at"),
+        # último movimento de um item (versão de estoque no ETag do catálogo)
+        Index("ix_stock_movements_item_id", "item_id", "id"),
+        Index("ix_stock_movements_created_at", "created_at"),
+    )
+
+# fotografia periódica do estoque de todos os itens (python -m app.jobs.stock_ledger snapshot);
+# o estoque do catálogo em uma data parte do último snapshot anterior e soma só os movimentos depois dele
+class StockSnapshot(Base):
+    __tablename__ = "stock_snapshots"
+
+    taken_at: Mapped[int] = mapped_column(Integer, primary_key=True)
+    item_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    stock: Mapped[int] = mapped_column(Integer, nullable=False)
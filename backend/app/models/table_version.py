@@ -0,0 +1,10 @@
+from sqlalchemy import String, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+# contador por tabela, incrementado na mesma transação de cada escrita; base dos ETags
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    name: Mapped[str] = mapped_column(String(40), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
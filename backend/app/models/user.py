@@ -1,5 +1,6 @@
-from sqlalchemy import String, Integer
+from sqlalchemy import String, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.core.config import settings
 from app.db.base import Base
 
 
@@ -12,4 +13,8 @@ class User(Base):
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     role: Mapped[str] = mapped_column(String(20), nullable=False, default="user") 
 
-    orders = relationship("Order", back_populates="user")
+    orders = relationship("Order", back_populates="user", lazy=settings.DB_COLLECTION_LAZY, passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_users_role_id", "role", "id"),
+    )
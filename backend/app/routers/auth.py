@@ -6,23 +6,23 @@ from app.core.deps import get_db
 from app.core.security import create_access_token
 from app.schemas.auth import RegisterRequest, LoginJSONRequest, TokenResponse
 from app.schemas.user import UserOut
-from app.services.user_service import create_user, authenticate_user
+from app.services.user_service import create_user_async, authenticate_user_async
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/register", response_model=UserOut)
-def register(req: RegisterRequest, db: Session = Depends(get_db)):
-    user = create_user(db, name=req.name, email=req.email, password=req.password, role="user")
+async def register(req: RegisterRequest, db: Session = Depends(get_db)):
+    user = await create_user_async(db, name=req.name, email=req.email, password=req.password, role="user")
     return user
 
 @router.post("/login", response_model=TokenResponse)
-def login(form: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, email=form.username, password=form.password)
-    token = create_access_token(subject=user.email)
+async def login(form: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    user = await authenticate_user_async(db, email=form.username, password=form.password)
+    token = create_access_token(subject=user.email, user_id=user.id, role=user.role)
     return TokenResponse(access_token=token)
 
 @router.post("/login-json", response_model=TokenResponse)
-def login_json(req: LoginJSONRequest, db: Session = Depends(get_db)):
-    user = authenticate_user(db, email=req.email, password=req.password)
-    token = create_access_token(subject=user.email)
+async def login_json(req: LoginJSONRequest, db: Session = Depends(get_db)):
+    user = await authenticate_user_async(db, email=req.email, password=req.password)
+    token = create_access_token(subject=user.email, user_id=user.id, role=user.role)
     return TokenResponse(access_token=token)
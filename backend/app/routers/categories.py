@@ -1,19 +1,22 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_db, require_admin
+from app.core.deps import get_db, get_read_db, require_admin
+from app.core.http_cache import catalog_cache
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryOut
-from app.services.category_service import list_categories, get_category, create_category, update_category, delete_category
+from app.services.category_service import (
+    list_categories_async, get_category_async, create_category, update_category, delete_category
+)
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
-@router.get("", response_model=list[CategoryOut])
-def list_all(db: Session = Depends(get_db)):
-    return list_categories(db)
+@router.get("", response_model=list[CategoryOut], dependencies=[Depends(catalog_cache("categories"))])
+async def list_all(db=Depends(get_read_db)):
+    return await list_categories_async(db)
 
-@router.get("/{category_id}", response_model=CategoryOut)
-def get_one(category_id: int, db: Session = Depends(get_db)):
-    return get_category(db, category_id)
+@router.get("/{category_id}", response_model=CategoryOut, dependencies=[Depends(catalog_cache("categories"))])
+async def get_one(category_id: int, db=Depends(get_read_db)):
+    return await get_category_async(db, category_id)
 
 @router.post("", response_model=CategoryOut, dependencies=[Depends(require_admin)])
 def create(req: CategoryCreate, db: Session = Depends(get_db)):
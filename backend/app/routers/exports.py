@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.deps import require_admin
+from app.services.export_service import export_items, export_orders, export_order_items, export_stock_at
+from app.services.ledger_service import to_epoch
+
+router = APIRouter(prefix="/exports", tags=["exports"], dependencies=[Depends(require_admin)])
+
+FORMAT_PATTERN = "^(ndjson|csv)$"
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+def _stream(chunks, name: str, fmt: str) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+@router.get("/items")
+def items(format: str = Query(default="ndjson", pattern=FORMAT_PATTERN)):
+    return _stream(export_items(format), "items", format)
+
+@router.get("/orders")
+def orders(format: str = Query(default="ndjson", pattern=FORMAT_PATTERN)):
+    return _stream(export_orders(format), "orders", format)
+
+@router.get("/order-items")
+def order_items(format: str = Query(default="ndjson", pattern=FORMAT_PATTERN)):
+    return _stream(export_order_items(format), "order_items", format)
+
+@router.get("/stock-at")
+def stock_at(at: datetime, format: str = Query(default="ndjson", pattern=FORMAT_PATTERN)):
+    # estoque de todos os itens na data: último snapshot até ela + movimentos do razão depois dele
+    return _stream(export_stock_at(to_epoch(at), format), "stock_at", format)
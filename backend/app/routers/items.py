@@ -1,27 +1,126 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query, Request, Response, UploadFile
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_db, require_admin
-from app.schemas.item import ItemCreate, ItemUpdate, ItemOut
-from app.services.item_service import list_items, get_item, create_item, update_item, delete_item
+from app.core.deps import get_db, get_read_db, get_stream_claims, require_admin, require_stream_admin
+from app.core.http_cache import catalog_cache
+from app.core.pagination import Page, page_params, set_next_cursor
+from app.core.serialization import json_response, rows_to_dicts
+from app.core.sse import sse_response
+from app.schemas.item import ItemCreate, ItemUpdate, ItemOut, ItemImportResult, ItemUpsert
+from app.schemas.stock_ledger import StockMovementOut, StockAtOut
+from app.services.search_service import search_items_async
+from app.services.ledger_service import list_movements_async, stock_at_async, to_epoch
+from app.services.low_stock_service import LOW_STOCK_TOPIC, list_low_stock_async
+from app.services.item_import_service import ensure_utf8, upsert_items, iter_csv_rows, iter_ndjson_rows
+from app.services.item_service import list_items_async, get_item_async, create_item, update_item, delete_item
 
 router = APIRouter(prefix="/items", tags=["items"])
 
-@router.get("", response_model=list[ItemOut])
-def get_items(db: Session = Depends(get_db)):
-    return list_items(db)
+@router.get("", response_model=list[ItemOut], dependencies=[Depends(catalog_cache("items", with_stock=True))])
+async def get_items(
+    response: Response,
+    page: Page = Depends(page_params),
+    category_id: int | None = Query(default=None, gt=0),
+    min_stock: int | None = Query(default=None, ge=0),
+    max_stock: int | None = Query(default=None, ge=0),
+    db=Depends(get_read_db),
+):
+    items = await list_items_async(
+        db,
+        after_id=page.after_id,
+        limit=page.limit,
+        category_id=category_id,
+        min_stock=min_stock,
+        max_stock=max_stock,
+    )
+    set_next_cursor(response, items, page)
+    return json_response(rows_to_dicts(items, ItemOut), response)
+
+@router.get("/search", response_model=list[ItemOut], dependencies=[Depends(catalog_cache("items", with_stock=True))])
+async def search(
+    response: Response,
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    category_id: int | None = Query(default=None, gt=0),
+    db=Depends(get_read_db),
+):
+    items = await search_items_async(db, q, limit=limit, category_id=category_id)
+    return json_response(rows_to_dicts(items, ItemOut), response)
+
+@router.get("/low-stock", response_model=list[ItemOut], dependencies=[Depends(require_admin)])
+async def low_stock(
+    response: Response,
+    page: Page = Depends(page_params),
+    category_id: int | None = Query(default=None, gt=0),
+    db=Depends(get_read_db),
+):
+    items = await list_low_stock_async(db, after_id=page.after_id, limit=page.limit, category_id=category_id)
+    set_next_cursor(response, items, page)
+    return json_response(rows_to_dicts(items, ItemOut), response)
+
+@router.get("/low-stock/stream", dependencies=[Depends(require_stream_admin)])
+async def low_stock_stream(request: Request, claims: dict = Depends(get_stream_claims)):
+    # eventos "low", "restocked" e "resync" (releia /items/low-stock); token em ?access_token=,
+    # como em /orders/stream, e a conexão fecha quando ele vence
+    return sse_response(request, LOW_STOCK_TOPIC, expires_at=claims.get("exp"))
 
-@router.get("/{item_id}", response_model=ItemOut)
-def get_item_by_id(item_id: int, db: Session = Depends(get_db)):
-    return get_item(db, item_id)
+@router.get("/{item_id}", response_model=ItemOut, dependencies=[Depends(catalog_cache("items", with_stock=True))])
+async def get_item_by_id(item_id: int, db=Depends(get_read_db)):
+    return await get_item_async(db, item_id)
+
+@router.get("/{item_id}/stock-movements", response_model=list[StockMovementOut], dependencies=[Depends(require_admin)])
+async def stock_movements(item_id: int, response: Response, page: Page = Depends(page_params), db=Depends(get_read_db)):
+    movements = await list_movements_async(db, item_id, after_id=page.after_id, limit=page.limit)
+    set_next_cursor(response, movements, page)
+    return json_response(rows_to_dicts(movements, StockMovementOut), response)
+
+@router.get("/{item_id}/stock-at", response_model=StockAtOut, dependencies=[Depends(require_admin)])
+async def stock_at(item_id: int, at: datetime, db=Depends(get_read_db)):
+    return {"item_id": item_id, "at": at, "stock": await stock_at_async(db, item_id, to_epoch(at))}
 
 @router.post("", response_model=ItemOut, dependencies=[Depends(require_admin)])
 def create(req: ItemCreate, db: Session = Depends(get_db)):
-    return create_item(db, name=req.name, description=req.description, stock=req.stock, category_id=req.category_id)
+    return create_item(
+        db,
+        name=req.name,
+        description=req.description,
+        stock=req.stock,
+        category_id=req.category_id,
+        reorder_threshold=req.reorder_threshold,
+    )
+
+@router.post("/bulk", response_model=ItemImportResult, dependencies=[Depends(require_admin)])
+def bulk_upsert(req: list[ItemUpsert | dict], db: Session = Depends(get_db)):
+    # ItemUpsert documenta a linha no OpenAPI; uma linha que não valida chega como dict e vira
+    # erro daquela linha no serviço, em vez de um 422 para o lote inteiro
+    return upsert_items(db, ((i, row) for i, row in enumerate(req)))
+
+@router.post("/import", response_model=ItemImportResult, dependencies=[Depends(require_admin)])
+def import_file(
+    file: UploadFile,
+    format: str | None = Query(default=None, pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_db),
+):
+    if format is None:
+        filename = (file.filename or "").lower()
+        format = "ndjson" if filename.endswith((".ndjson", ".jsonl")) else "csv"
+    ensure_utf8(file.file)
+    rows = iter_csv_rows(file.file) if format == "csv" else iter_ndjson_rows(file.file)
+    return upsert_items(db, rows)
 
 @router.put("/{item_id}", response_model=ItemOut, dependencies=[Depends(require_admin)])
 def update(item_id: int, req: ItemUpdate, db: Session = Depends(get_db)):
-    return update_item(db, item_id, name=req.name, description=req.description, stock=req.stock, category_id=req.category_id)
+    return update_item(
+        db,
+        item_id,
+        name=req.name,
+        description=req.description,
+        stock=req.stock,
+        category_id=req.category_id,
+        reorder_threshold=req.reorder_threshold,
+    )
 
 @router.delete("/{item_id}", dependencies=[Depends(require_admin)])
 def delete(item_id: int, db: Session = Depends(get_db)):
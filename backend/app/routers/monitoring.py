@@ -0,0 +1,47 @@
+import anyio.to_thread
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.core.deps import require_admin
+from app.core.events import broker
+from app.core.hashing import hashing_pool
+from app.core.jobs import queue_stats
+from app.core.metrics import registry, threadpool_capacity, threadpool_in_use
+from app.core.principal_cache import principal_cache
+from app.services.record_cache_service import cache_stats
+
+router = APIRouter(tags=["monitoring"])
+
+bcrypt_pool = registry.gauge("bcrypt_pool", "Estado do pool de hashing (fila, ativos, concluídos, recusados).")
+cache_counters = registry.gauge("cache_lookups", "Acertos e falhas dos caches em memória.")
+event_streams = registry.gauge("event_streams", "Conexões SSE/WebSocket abertas e tópicos com assinantes.")
+
+def _all_cache_stats() -> dict:
+    return {"principal": principal_cache.stats(), **cache_stats()}
+
+@registry.collector
+def _collect():
+    stats = hashing_pool.stats()
+    for field in ("queue_depth", "active", "completed", "rejected"):
+        bcrypt_pool.set(stats[field], state=field)
+    for name, cache in _all_cache_stats().items():
+        cache_counters.set(cache["hits"], cache=name, result="hit")
+        cache_counters.set(cache["misses"], cache=name, result="miss")
+    for field, value in broker.stats().items():
+        event_streams.set(value, kind=field)
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    # o limiter do anyio só pode ser lido dentro do event loop
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    threadpool_in_use.set(limiter.borrowed_tokens)
+    threadpool_capacity.set(limiter.total_tokens)
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@router.get("/monitoring/caches", dependencies=[Depends(require_admin)])
+def caches():
+    return _all_cache_stats()
+
+@router.get("/monitoring/jobs", dependencies=[Depends(require_admin)])
+def jobs():
+    return queue_stats()
@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, require_admin
+from app.core.pagination import Page, page_params, set_next_cursor
 from app.schemas.order_item import OrderItemOutFull, OrderItemUpdate
 from app.services.order_item_service import list_order_items, get_order_item, update_order_item_quantity, delete_order_item
 
 router = APIRouter(prefix="/order-items", tags=["order-items"], dependencies=[Depends(require_admin)])
 
 @router.get("", response_model=list[OrderItemOutFull])
-def list_all(db: Session = Depends(get_db)):
-    return list_order_items(db)
+def list_all(
+    response: Response,
+    page: Page = Depends(page_params),
+    order_id: int | None = Query(default=None, gt=0),
+    item_id: int | None = Query(default=None, gt=0),
+    db: Session = Depends(get_db),
+):
+    order_items = list_order_items(db, after_id=page.after_id, limit=page.limit, order_id=order_id, item_id=item_id)
+    set_next_cursor(response, order_items, page)
+    return order_items
 
 @router.get("/{order_item_id}", response_model=OrderItemOutFull)
 def detail(order_item_id: int, db: Session = Depends(get_db)):
@@ -1,14 +1,39 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, WebSocket, status as http_status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.core.deps import get_db, get_current_user, require_admin
-from app.schemas.order import OrderCreate, OrderOut, OrderItemOut
+from app.core.deps import (
+    get_db, get_read_db, get_current_user, require_admin, get_stream_claims, get_stream_user, require_stream_admin,
+    decode_token, principal_from_claims
+)
+from app.core.pagination import Page, page_params, set_next_cursor
+from app.core.serialization import json_response, rows_to_dicts
+from app.core.sse import sse_response
+from app.core.websocket import websocket_feed
+from app.schemas.order import OrderCreate, OrderOut, OrderItemOut, OrderBulkStatusRequest, OrderStatusOutcome
+from app.services.idempotency_service import REPLAYED_HEADER, claim_idempotency_key, request_fingerprint
+from app.services.order_feed_service import ORDERS_ADMIN_TOPIC, user_orders_topic
 from app.services.order_service import (
-    create_order, list_orders_all, list_orders_for_user, get_order, set_status, delete_order
+    create_order, list_orders_all_async, list_orders_for_user_async, get_order, get_order_async, set_status,
+    set_status_bulk, delete_order
 )
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
+STATUS_PATTERN = "^(pending|approved|rejected|finished)$"
+
+def orders_json(orders, response: Response):
+    # mesmo formato de OrderOut, montado direto das linhas já carregadas (selectinload)
+    return json_response([
+        {
+            "id": o.id,
+            "user_id": o.user_id,
+            "status": o.status,
+            "items": rows_to_dicts(o.items, OrderItemOut),
+        }
+        for o in orders
+    ], response)
+
 def to_order_out(order) -> OrderOut:
     return OrderOut(
         id=order.id,
@@ -18,24 +43,91 @@ def to_order_out(order) -> OrderOut:
     )
 
 @router.post("", response_model=OrderOut)
-def create(req: OrderCreate, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    order = create_order(db, user_id=user.id, items=[i.model_dump() for i in req.items])
-    order = get_order(db, order.id)
+def create(
+    req: OrderCreate,
+    response: Response,
+    idempotency_key: str | None = Header(default=None, min_length=1, max_length=255),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    items = [i.model_dump() for i in req.items]
+    if idempotency_key is not None:
+        stored = claim_idempotency_key(db, user.id, idempotency_key, request_fingerprint(items))
+        if stored is not None:
+            # repetição do cliente: devolve o pedido original sem reservar estoque de novo
+            response.headers[REPLAYED_HEADER] = "true"
+            return stored
+    order = create_order(db, user_id=user.id, items=items, idempotency_key=idempotency_key)
     return to_order_out(order)
 
 @router.get("/me", response_model=list[OrderOut])
-def my_orders(db: Session = Depends(get_db), user=Depends(get_current_user)):
-    orders = list_orders_for_user(db, user.id)
-    return [to_order_out(o) for o in orders]
+async def my_orders(
+    response: Response,
+    page: Page = Depends(page_params),
+    status: str | None = Query(default=None, pattern=STATUS_PATTERN),
+    db=Depends(get_read_db),
+    user=Depends(get_current_user),
+):
+    orders = await list_orders_for_user_async(db, user.id, after_id=page.after_id, limit=page.limit, status=status)
+    set_next_cursor(response, orders, page)
+    return orders_json(orders, response)
 
 @router.get("", response_model=list[OrderOut], dependencies=[Depends(require_admin)])
-def list_all(db: Session = Depends(get_db)):
-    orders = list_orders_all(db)
-    return [to_order_out(o) for o in orders]
+async def list_all(
+    response: Response,
+    page: Page = Depends(page_params),
+    status: str | None = Query(default=None, pattern=STATUS_PATTERN),
+    user_id: int | None = Query(default=None, gt=0),
+    db=Depends(get_read_db),
+):
+    orders = await list_orders_all_async(db, after_id=page.after_id, limit=page.limit, status=status, user_id=user_id)
+    set_next_cursor(response, orders, page)
+    return orders_json(orders, response)
+
+# eventos "created", "status" e "deleted": /me/* recebe só os pedidos do usuário, os demais (admin) todos.
+# EventSource/WebSocket do navegador mandam o token em ?access_token=; a conexão fecha quando ele vence
+
+@router.get("/me/stream")
+async def my_orders_stream(request: Request, claims: dict = Depends(get_stream_claims), user=Depends(get_stream_user)):
+    return sse_response(request, user_orders_topic(user.id), expires_at=claims.get("exp"))
+
+@router.get("/stream", dependencies=[Depends(require_stream_admin)])
+async def orders_stream(request: Request, claims: dict = Depends(get_stream_claims)):
+    return sse_response(request, ORDERS_ADMIN_TOPIC, expires_at=claims.get("exp"))
+
+async def _authenticate_websocket(websocket: WebSocket, access_token: str | None, admin: bool):
+    try:
+        if not access_token:
+            raise HTTPException(401, "Não autenticado.")
+        claims = decode_token(access_token)
+        user = await run_in_threadpool(principal_from_claims, claims)
+        if admin and user.role != "admin":
+            raise HTTPException(403, "Acesso restrito ao admin.")
+    except HTTPException:
+        # antes do accept: o handshake é recusado
+        await websocket.close(code=http_status.WS_1008_POLICY_VIOLATION)
+        return None, None
+    return user, claims
+
+@router.websocket("/me/ws")
+async def my_orders_ws(websocket: WebSocket, access_token: str | None = Query(default=None)):
+    user, claims = await _authenticate_websocket(websocket, access_token, admin=False)
+    if user is not None:
+        await websocket_feed(websocket, user_orders_topic(user.id), expires_at=claims.get("exp"))
+
+@router.websocket("/ws")
+async def orders_ws(websocket: WebSocket, access_token: str | None = Query(default=None)):
+    user, claims = await _authenticate_websocket(websocket, access_token, admin=True)
+    if user is not None:
+        await websocket_feed(websocket, ORDERS_ADMIN_TOPIC, expires_at=claims.get("exp"))
+
+@router.post("/bulk-status", response_model=list[OrderStatusOutcome], dependencies=[Depends(require_admin)])
+def bulk_status(req: OrderBulkStatusRequest, db: Session = Depends(get_db)):
+    return set_status_bulk(db, req.order_ids, req.status)
 
 @router.get("/{order_id}", response_model=OrderOut)
-def detail(order_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    order = get_order(db, order_id)
+async def detail(order_id: int, db=Depends(get_read_db), user=Depends(get_current_user)):
+    order = await get_order_async(db, order_id)
     if user.role != "admin" and order.user_id != user.id:
         # evitar vazar pedido de outros usuários
         from fastapi import HTTPException
@@ -54,17 +146,14 @@ def delete_pending(order_id: int, db: Session = Depends(get_db), user=Depends(ge
 @router.post("/{order_id}/approve", response_model=OrderOut, dependencies=[Depends(require_admin)])
 def approve(order_id: int, db: Session = Depends(get_db)):
     o = set_status(db, order_id, "approved", only_if="pending")
-    o = get_order(db, o.id)
     return to_order_out(o)
 
 @router.post("/{order_id}/reject", response_model=OrderOut, dependencies=[Depends(require_admin)])
 def reject(order_id: int, db: Session = Depends(get_db)):
     o = set_status(db, order_id, "rejected", only_if="pending", restore_stock_on_reject=True)
-    o = get_order(db, o.id)
     return to_order_out(o)
 
 @router.post("/{order_id}/finish", response_model=OrderOut, dependencies=[Depends(require_admin)])
 def finish(order_id: int, db: Session = Depends(get_db)):
     o = set_status(db, order_id, "finished", only_if="approved")
-    o = get_order(db, o.id)
     return to_order_out(o)
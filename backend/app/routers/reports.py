@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.core.deps import get_read_db, require_admin
+from app.schemas.report import TopItemOut, CategoryConsumptionOut
+from app.services.summary_service import orders_by_status_async, top_items_async, consumption_by_category_async
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+@router.get("/orders-by-status", response_model=dict[str, int], dependencies=[Depends(require_admin)])
+async def orders_by_status(db=Depends(get_read_db)):
+    return await orders_by_status_async(db)
+
+@router.get("/top-items", response_model=list[TopItemOut], dependencies=[Depends(require_admin)])
+async def top_items(limit: int = Query(default=10, ge=1, le=100), db=Depends(get_read_db)):
+    return await top_items_async(db, limit=limit)
+
+@router.get("/consumption-by-category", response_model=list[CategoryConsumptionOut], dependencies=[Depends(require_admin)])
+async def consumption_by_category(db=Depends(get_read_db)):
+    return await consumption_by_category_async(db)
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, get_current_user, require_admin
 from app.core.config import settings
+from app.core.pagination import Page, page_params, set_next_cursor
+from app.core.serialization import json_response, rows_to_dicts
 from app.schemas.user import UserOut, UpdateProfileRequest, AdminUserUpdate
-from app.services.user_service import list_users, get_user, update_profile, admin_update_user, delete_user
+from app.services.user_service import list_users, get_user, update_profile_async, admin_update_user, delete_user
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -13,14 +15,20 @@ def me(current_user=Depends(get_current_user)):
     return current_user
 
 @router.put("/me", response_model=UserOut)
-def update_me(req: UpdateProfileRequest, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    user = update_profile(db, current_user, req.new_email, req.new_password, settings.ADMIN_EMAIL)
-    return user
+async def update_me(req: UpdateProfileRequest, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    return await update_profile_async(db, current_user.id, req.new_email, req.new_password, settings.ADMIN_EMAIL)
 
 # Admin CRUD de usuários (conta como entidade com CRUD)
 @router.get("", response_model=list[UserOut], dependencies=[Depends(require_admin)])
-def admin_list(db: Session = Depends(get_db)):
-    return list_users(db)
+def admin_list(
+    response: Response,
+    page: Page = Depends(page_params),
+    role: str | None = Query(default=None, pattern="^(user|admin)$"),
+    db: Session = Depends(get_db),
+):
+    users = list_users(db, after_id=page.after_id, limit=page.limit, role=role)
+    set_next_cursor(response, users, page)
+    return json_response(rows_to_dicts(users, UserOut), response)
 
 @router.get("/{user_id}", response_model=UserOut, dependencies=[Depends(require_admin)])
 def admin_get(user_id: int, db: Session = Depends(get_db)):
@@ -5,12 +5,14 @@ class ItemCreate(BaseModel):
     description: str | None = None
     stock: int = Field(ge=0)
     category_id: int = Field(gt=0)
+    reorder_threshold: int = Field(default=0, ge=0)
 
 class ItemUpdate(BaseModel):
     name: str | None = Field(default=None, min_length=2, max_length=160)
     description: str | None = None
     stock: int | None = Field(default=None, ge=0)
     category_id: int | None = Field(default=None, gt=0)
+    reorder_threshold: int | None = Field(default=None, ge=0)
 
 class ItemOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -19,3 +21,17 @@ class ItemOut(BaseModel):
     description: str | None
     stock: int
     category_id: int
+    reorder_threshold: int
+
+class ItemUpsert(ItemCreate):
+    id: int | None = Field(default=None, gt=0)
+
+class ItemImportError(BaseModel):
+    row: int
+    detail: str
+
+class ItemImportResult(BaseModel):
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: list[ItemImportError] = []
@@ -17,3 +17,13 @@ class OrderOut(BaseModel):
     user_id: int
     status: str
     items: list[OrderItemOut]
+
+class OrderBulkStatusRequest(BaseModel):
+    order_ids: list[int] = Field(min_length=1, max_length=10000)
+    status: str = Field(pattern="^(approved|rejected|finished)$")
+
+class OrderStatusOutcome(BaseModel):
+    order_id: int
+    ok: bool
+    status: str | None = None
+    detail: str | None = None
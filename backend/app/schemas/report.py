@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+class TopItemOut(BaseModel):
+    item_id: int
+    name: str
+    requested: int
+    consumed: int
+
+class CategoryConsumptionOut(BaseModel):
+    category_id: int
+    name: str
+    consumed: int
@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+class StockMovementOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    item_id: int
+    delta: int
+    stock_after: int
+    reason: str
+    order_id: int | None
+    created_at: int
+
+class StockAtOut(BaseModel):
+    item_id: int
+    at: datetime
+    stock: int
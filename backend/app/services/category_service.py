@@ -1,23 +1,63 @@
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import exists, select
+from app.db.reads import fetch_all, fetch_by_id
 from app.models.category import Category
+from app.models.item import Item
+from app.services.version_service import bump_version
+from app.services.record_cache_service import (
+    ALL_CATEGORIES_KEY, category_cache, category_snapshot, invalidate_on_commit
+)
 
 def list_categories(db: Session) -> list[Category]:
     return list(db.scalars(select(Category)))
 
+async def list_categories_async(db: AsyncSession | Session) -> list[dict]:
+    cached = category_cache.get(ALL_CATEGORIES_KEY)
+    if cached is not None:
+        return cached
+    generation = category_cache.generation(ALL_CATEGORIES_KEY)
+    cats = [category_snapshot(c) for c in await fetch_all(db, select(Category))]
+    category_cache.set(ALL_CATEGORIES_KEY, cats, generation)
+    return cats
+
 def get_category(db: Session, category_id: int) -> Category:
     cat = db.get(Category, category_id)
     if not cat:
         raise HTTPException(404, "Categoria não encontrada.")
     return cat
 
+async def get_category_async(db: AsyncSession | Session, category_id: int) -> dict:
+    cached = category_cache.get(category_id)
+    if cached is not None:
+        return cached
+    generation = category_cache.generation(category_id)
+    cat = await fetch_by_id(db, Category, category_id)
+    if not cat:
+        raise HTTPException(404, "Categoria não encontrada.")
+    snapshot = category_snapshot(cat)
+    category_cache.set(category_id, snapshot, generation)
+    return snapshot
+
+def category_exists(db: Session, category_id: int) -> bool:
+    if category_cache.get(category_id) is not None:
+        return True
+    generation = category_cache.generation(category_id)
+    cat = db.get(Category, category_id)
+    if not cat:
+        return False
+    category_cache.set(category_id, category_snapshot(cat), generation)
+    return True
+
 def create_category(db: Session, name: str) -> Category:
     existing = db.scalar(select(Category).where(Category.name == name))
     if existing:
         raise HTTPException(400, "Já existe categoria com esse nome.")
     cat = Category(name=name)
     db.add(cat)
+    bump_version(db, "categories")
+    invalidate_on_commit(db, category_cache, ALL_CATEGORIES_KEY)
     db.commit()
     db.refresh(cat)
     return cat
@@ -28,13 +68,17 @@ def update_category(db: Session, category_id: int, name: str) -> Category:
     if existing and existing.id != cat.id:
         raise HTTPException(400, "Já existe categoria com esse nome.")
     cat.name = name
+    bump_version(db, "categories")
+    invalidate_on_commit(db, category_cache, category_id, ALL_CATEGORIES_KEY)
     db.commit()
     db.refresh(cat)
     return cat
 
 def delete_category(db: Session, category_id: int) -> None:
     cat = get_category(db, category_id)
-    if cat.items:
+    if db.scalar(select(exists().where(Item.category_id == category_id))):
         raise HTTPException(400, "Não é possível remover categoria com itens associados.")
     db.delete(cat)
+    bump_version(db, "categories")
+    invalidate_on_commit(db, category_cache, category_id, ALL_CATEGORIES_KEY)
     db.commit()
@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+from typing import Iterable, Iterator, Sequence
+
+from sqlalchemy import select
+
+from app.db.session import ReadSessionLocal
+from app.models.item import Item
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.services.ledger_service import catalog_stock_at_query, latest_snapshot_at
+
+EXPORT_BATCH_SIZE = 2000
+
+ITEM_COLUMNS = ("id", "name", "description", "stock", "category_id", "reorder_threshold")
+ORDER_LINE_COLUMNS = ("order_id", "user_id", "status", "order_item_id", "item_id", "quantity")
+ORDER_ITEM_COLUMNS = ("id", "order_id", "item_id", "quantity")
+STOCK_AT_COLUMNS = ("item_id", "stock")
+
+# os geradores abrem a própria sessão: a resposta é transmitida depois que as
+# dependências da rota já foram encerradas
+
+def _stream_partitions(stmt) -> Iterator[Sequence]:
+    db = ReadSessionLocal()
+    try:
+        # yield_per => cursor no servidor (Postgres) e lotes de tamanho fixo em memória
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for partition in result.partitions():
+            yield partition
+    finally:
+        db.close()
+
+def _csv_chunk(rows: Iterable[Sequence], header: Sequence[str] | None = None) -> str:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    if header:
+        writer.writerow(header)
+    writer.writerows(rows)
+    return buf.getvalue()
+
+def _ndjson_chunk(objects: Iterable[dict]) -> str:
+    return "".join(json.dumps(obj, ensure_ascii=False) + "\n" for obj in objects)
+
+def _export_flat(stmt, columns: Sequence[str], fmt: str) -> Iterator[str]:
+    if fmt == "csv":
+        yield _csv_chunk([], header=columns)
+    for partition in _stream_partitions(stmt):
+        if fmt == "csv":
+            yield _csv_chunk(partition)
+        else:
+            yield _ndjson_chunk(dict(zip(columns, row)) for row in partition)
+
+def export_items(fmt: str) -> Iterator[str]:
+    stmt = select(*(getattr(Item, c) for c in ITEM_COLUMNS)).order_by(Item.id)
+    return _export_flat(stmt, ITEM_COLUMNS, fmt)
+
+def export_order_items(fmt: str) -> Iterator[str]:
+    stmt = select(*(getattr(OrderItem, c) for c in ORDER_ITEM_COLUMNS)).order_by(OrderItem.id)
+    return _export_flat(stmt, ORDER_ITEM_COLUMNS, fmt)
+
+def export_stock_at(at: int, fmt: str) -> Iterator[str]:
+    db = ReadSessionLocal()
+    try:
+        base = latest_snapshot_at(db, at)
+    finally:
+        db.close()
+    yield from _export_flat(catalog_stock_at_query(base, at), STOCK_AT_COLUMNS, fmt)
+
+def export_orders(fmt: str) -> Iterator[str]:
+    # uma única query com as linhas já juntadas; o agrupamento por pedido é feito
+    # aqui, mantendo em memória só o pedido corrente
+    stmt = (
+        select(Order.id, Order.user_id, Order.status, OrderItem.id, OrderItem.item_id, OrderItem.quantity)
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .order_by(Order.id, OrderItem.id)
+    )
+    if fmt == "csv":
+        yield from _export_flat(stmt, ORDER_LINE_COLUMNS, fmt)
+        return
+
+    current: dict | None = None
+    for partition in _stream_partitions(stmt):
+        done = []
+        for order_id, user_id, status, _order_item_id, item_id, quantity in partition:
+            if current is None or current["id"] != order_id:
+                if current is not None:
+                    done.append(current)
+                current = {"id": order_id, "user_id": user_id, "status": status, "items": []}
+            if item_id is not None:
+                current["items"].append({"item_id": item_id, "quantity": quantity})
+        if done:
+            yield _ndjson_chunk(done)
+    if current is not None:
+        yield _ndjson_chunk([current])
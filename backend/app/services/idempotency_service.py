@@ -0,0 +1,81 @@
+import hashlib
+import json
+import time
+
+from fastapi import HTTPException
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+_last_purge = 0.0
+
+def request_fingerprint(payload) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def _replay(row: IdempotencyKey, fingerprint: str) -> dict:
+    if row.fingerprint != fingerprint:
+        raise HTTPException(422, "Idempotency-Key já usada com outro pedido.")
+    return json.loads(row.response)
+
+def _purge_expired(db: Session, cutoff: int) -> None:
+    # no máximo uma limpeza por intervalo e por processo; usa o índice em created_at
+    global _last_purge
+    now = time.monotonic()
+    if now - _last_purge < settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS:
+        return
+    _last_purge = now
+    db.execute(
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.created_at < cutoff)
+        .execution_options(synchronize_session=False)
+    )
+
+def _replay_after_conflict(db: Session, user_id: int, key: str, fingerprint: str) -> dict:
+    db.rollback()
+    row = db.get(IdempotencyKey, (user_id, key))
+    if row is None or row.response is None:
+        raise HTTPException(409, "Requisição com a mesma Idempotency-Key em andamento.")
+    return _replay(row, fingerprint)
+
+def claim_idempotency_key(db: Session, user_id: int, key: str, fingerprint: str) -> dict | None:
+    # devolve a resposta guardada (repetição) ou None depois de reservar a chave na transação
+    # atual; quem reserva precisa gravar a resposta com save_idempotent_response antes do commit
+    now = int(time.time())
+    cutoff = now - settings.IDEMPOTENCY_TTL_SECONDS
+
+    row = db.get(IdempotencyKey, (user_id, key))
+    if row is not None and row.created_at >= cutoff:
+        return _replay(row, fingerprint)
+
+    if row is not None:
+        # chave expirada: reaproveita a linha, mas só se ninguém a renovou no meio do caminho
+        renewed = db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key, IdempotencyKey.created_at < cutoff)
+            .values(fingerprint=fingerprint, response=None, created_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.expire(row)
+        if renewed.rowcount != 1:
+            return _replay_after_conflict(db, user_id, key, fingerprint)
+    else:
+        db.add(IdempotencyKey(user_id=user_id, key=key, fingerprint=fingerprint, created_at=now))
+        try:
+            # uma requisição concorrente com a mesma chave espera aqui pelo lock de escrita
+            # até a primeira terminar; então o INSERT colide com a chave já gravada
+            db.flush()
+        except IntegrityError:
+            return _replay_after_conflict(db, user_id, key, fingerprint)
+
+    _purge_expired(db, cutoff)
+    return None
+
+def save_idempotent_response(db: Session, user_id: int, key: str, response: dict) -> None:
+    row = db.get(IdempotencyKey, (user_id, key))
+    row.response = json.dumps(response, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,150 @@
+import codecs
+import csv
+import io
+import json
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.category import Category
+from app.models.item import Item
+from app.schemas.item import ItemUpsert
+from app.services.ledger_service import movement, record_movements
+from app.services.low_stock_service import announce_resync
+from app.services.version_service import bump_version
+from app.services.record_cache_service import item_cache, invalidate_on_commit
+
+IMPORT_CHUNK_SIZE = 1000
+# limite de erros detalhados na resposta; o total continua em "failed"
+MAX_REPORTED_ERRORS = 1000
+
+UPSERT_COLUMNS = ("name", "description", "stock", "category_id", "reorder_threshold")
+
+def ensure_utf8(stream: BinaryIO, chunk_size: int = 1 << 20) -> None:
+    # confere a codificação do arquivo inteiro antes do primeiro lote: os lotes são commitados
+    # um a um, e um byte inválido no meio deixaria a importação pela metade
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    line = 1
+    try:
+        while chunk := stream.read(chunk_size):
+            decoder.decode(chunk)
+            line += chunk.count(b"\n")
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        line += e.object[:e.start].count(b"\n")
+        raise HTTPException(400, f"Arquivo precisa estar em UTF-8 (linha {line}).")
+    finally:
+        stream.seek(0)
+
+def iter_csv_rows(stream: BinaryIO) -> Iterator[tuple[int, dict]]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    # linha 1 é o cabeçalho
+    for row_number, row in enumerate(csv.DictReader(text), start=2):
+        yield row_number, {k: (v if v != "" else None) for k, v in row.items() if k}
+
+def iter_ndjson_rows(stream: BinaryIO) -> Iterator[tuple[int, dict | None]]:
+    for row_number, line in enumerate(io.TextIOWrapper(stream, encoding="utf-8-sig"), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            row = None
+        yield row_number, row if isinstance(row, dict) else None
+
+def _upsert_statement(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        stmt = sqlite_insert(Item)
+    elif dialect == "postgresql":
+        stmt = pg_insert(Item)
+    else:
+        return None
+    return stmt.on_conflict_do_update(
+        index_elements=[Item.id],
+        set_={col: stmt.excluded[col] for col in UPSERT_COLUMNS},
+    )
+
+def _write_chunk(db: Session, chunk: list[dict], result: dict) -> None:
+    with_id = [row for row in chunk if row.get("id") is not None]
+    without_id = [{k: row[k] for k in UPSERT_COLUMNS} for row in chunk if row.get("id") is None]
+
+    movements = []
+    if with_id:
+        # estoque anterior de cada id: o import grava valores absolutos, o razão guarda a diferença
+        existing = dict(db.execute(select(Item.id, Item.stock).where(Item.id.in_([row["id"] for row in with_id]))).all())
+        upsert = _upsert_statement(db)
+        if upsert is not None:
+            db.execute(upsert, with_id)
+        else:
+            for row in with_id:
+                db.merge(Item(**row))
+        invalidate_on_commit(db, item_cache, *(row["id"] for row in with_id))
+        result["updated"] += sum(1 for row in with_id if row["id"] in existing)
+        result["inserted"] += sum(1 for row in with_id if row["id"] not in existing)
+        movements += [
+            movement(row["id"], row["stock"] - existing.get(row["id"], 0), row["stock"], "import")
+            for row in with_id
+            if existing.get(row["id"]) != row["stock"]
+        ]
+
+    if without_id:
+        # executemany: um único INSERT preparado para o lote inteiro; o RETURNING traz os ids para o razão
+        created = db.execute(insert(Item).returning(Item.id, Item.stock), without_id).all()
+        movements += [movement(item_id, stock, stock, "import") for item_id, stock in created]
+        result["inserted"] += len(without_id)
+
+    record_movements(db, movements)
+    bump_version(db, "items")
+    db.commit()
+
+def upsert_items(db: Session, rows: Iterable[tuple[int, dict | None]], chunk_size: int = IMPORT_CHUNK_SIZE) -> dict:
+    result = {"inserted": 0, "updated": 0, "failed": 0, "errors": []}
+    # categorias são poucas: um SELECT só para validar todas as linhas do arquivo
+    category_ids = set(db.scalars(select(Category.id)))
+
+    def fail(row_number: int, detail: str) -> None:
+        result["failed"] += 1
+        if len(result["errors"]) < MAX_REPORTED_ERRORS:
+            result["errors"].append({"row": row_number, "detail": detail})
+
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, chunk_size))
+        if not batch:
+            break
+
+        chunk: list[dict] = []
+        seen_ids: set[int] = set()
+        for row_number, raw in batch:
+            if raw is None:
+                fail(row_number, "Linha inválida.")
+                continue
+            try:
+                row = ItemUpsert.model_validate(raw).model_dump()
+            except ValidationError as e:
+                err = e.errors()[0]
+                fail(row_number, f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}")
+                continue
+            if row["category_id"] not in category_ids:
+                fail(row_number, "Categoria inválida.")
+                continue
+            if row["id"] is not None:
+                if row["id"] in seen_ids:
+                    fail(row_number, "Id repetido no mesmo lote.")
+                    continue
+                seen_ids.add(row["id"])
+            chunk.append(row)
+
+        if chunk:
+            _write_chunk(db, chunk, result)
+
+    if result["inserted"] or result["updated"]:
+        announce_resync()
+    return result
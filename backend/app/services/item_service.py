@@ -1,12 +1,44 @@
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import Select, exists, select, update
 
+from app.db.reads import fetch_all, fetch_by_id
 from app.models.item import Item
-from app.models.category import Category
+from app.models.order_item import OrderItem
+from app.services.category_service import category_exists
+from app.services.ledger_service import movement, record_movements
+from app.services.low_stock_service import track_stock_change
+from app.services.version_service import bump_version
+from app.services.record_cache_service import item_cache, item_snapshot, invalidate_on_commit
 
-def list_items(db: Session) -> list[Item]:
-    return list(db.scalars(select(Item)))
+def items_query(
+    *,
+    after_id: int | None = None,
+    limit: int | None = None,
+    category_id: int | None = None,
+    min_stock: int | None = None,
+    max_stock: int | None = None,
+) -> Select:
+    stmt = select(Item).order_by(Item.id)
+    if after_id is not None:
+        stmt = stmt.where(Item.id > after_id)
+    if category_id is not None:
+        stmt = stmt.where(Item.category_id == category_id)
+    if min_stock is not None:
+        stmt = stmt.where(Item.stock >= min_stock)
+    if max_stock is not None:
+        stmt = stmt.where(Item.stock <= max_stock)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+def list_items(db: Session, **filters) -> list[Item]:
+    return list(db.scalars(items_query(**filters)))
+
+async def list_items_async(db: AsyncSession | Session, **filters) -> list[Item]:
+    return await fetch_all(db, items_query(**filters))
 
 def get_item(db: Session, item_id: int) -> Item:
     item = db.get(Item, item_id)
@@ -14,21 +46,47 @@ def get_item(db: Session, item_id: int) -> Item:
         raise HTTPException(404, "Item não encontrado.")
     return item
 
-def create_item(db: Session, *, name: str, description: str | None, stock: int, category_id: int) -> Item:
-    cat = db.get(Category, category_id)
-    if not cat:
+async def get_item_async(db: AsyncSession | Session, item_id: int) -> dict:
+    cached = item_cache.get(item_id)
+    if cached is not None:
+        return cached
+    generation = item_cache.generation(item_id)
+    item = await fetch_by_id(db, Item, item_id)
+    if not item:
+        raise HTTPException(404, "Item não encontrado.")
+    snapshot = item_snapshot(item)
+    item_cache.set(item_id, snapshot, generation)
+    return snapshot
+
+def create_item(
+    db: Session, *, name: str, description: str | None, stock: int, category_id: int, reorder_threshold: int = 0
+) -> Item:
+    if not category_exists(db, category_id):
         raise HTTPException(400, "Categoria inválida.")
-    item = Item(name=name, description=description, stock=stock, category_id=category_id)
+    item = Item(name=name, description=description, stock=stock, category_id=category_id, reorder_threshold=reorder_threshold)
     db.add(item)
+    db.flush()
+    record_movements(db, [movement(item.id, item.stock, item.stock, "create")])
+    track_stock_change(db, item.id, item.name, before=None, after=(item.stock, item.reorder_threshold))
+    bump_version(db, "items")
     db.commit()
     db.refresh(item)
     return item
 
-def update_item(db: Session, item_id: int, *, name: str | None, description: str | None, stock: int | None, category_id: int | None) -> Item:
+def update_item(
+    db: Session,
+    item_id: int,
+    *,
+    name: str | None,
+    description: str | None,
+    stock: int | None,
+    category_id: int | None,
+    reorder_threshold: int | None = None,
+) -> Item:
     item = get_item(db, item_id)
+    before = (item.stock, item.reorder_threshold)
     if category_id is not None:
-        cat = db.get(Category, category_id)
-        if not cat:
+        if not category_exists(db, category_id):
             raise HTTPException(400, "Categoria inválida.")
         item.category_id = category_id
     if name is not None:
@@ -38,14 +96,36 @@ def update_item(db: Session, item_id: int, *, name: str | None, description: str
     if stock is not None:
         if stock < 0:
             raise HTTPException(400, "Estoque inválido.")
-        item.stock = stock
+        if stock != before[0]:
+            # ajuste absoluto só vale se ninguém mexeu no estoque desde a leitura; assim o delta do razão é exato
+            changed = db.execute(
+                update(Item)
+                .where(Item.id == item_id, Item.stock == before[0])
+                .values(stock=stock)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if not changed:
+                db.rollback()
+                raise HTTPException(409, "Estoque do item alterado por outra operação; tente novamente.")
+            set_committed_value(item, "stock", stock)
+            record_movements(db, [movement(item_id, stock - before[0], stock, "adjust")])
+    if reorder_threshold is not None:
+        if reorder_threshold < 0:
+            raise HTTPException(400, "Limite de reposição inválido.")
+        item.reorder_threshold = reorder_threshold
+    track_stock_change(db, item.id, item.name, before=before, after=(item.stock, item.reorder_threshold))
+    bump_version(db, "items")
+    invalidate_on_commit(db, item_cache, item_id)
     db.commit()
     db.refresh(item)
     return item
 
 def delete_item(db: Session, item_id: int) -> None:
     item = get_item(db, item_id)
-    if item.order_items:
+    if db.scalar(select(exists().where(OrderItem.item_id == item_id))):
         raise HTTPException(400, "Não é possível remover item que já apareceu em pedidos.")
+    record_movements(db, [movement(item_id, -item.stock, 0, "delete")])
     db.delete(item)
+    bump_version(db, "items")
+    invalidate_on_commit(db, item_cache, item_id)
     db.commit()
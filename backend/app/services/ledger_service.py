@@ -0,0 +1,120 @@
+import time
+from datetime import datetime, timezone
+from typing import Iterator
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy import Select, func, insert, literal, select, union_all
+
+from app.core.config import settings
+from app.db.reads import fetch_all, fetch_scalar
+from app.models.item import Item
+from app.models.stock_ledger import StockMovement, StockSnapshot
+
+# toda escrita em items.stock grava aqui, na mesma transação, o delta e o saldo resultante;
+# um rollback desfaz os dois juntos
+
+def to_epoch(at: datetime) -> int:
+    # datas sem fuso são tratadas como UTC
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return int(at.timestamp())
+
+def movement(item_id: int, delta: int, stock_after: int, reason: str, order_id: int | None = None) -> dict:
+    return {"item_id": item_id, "delta": delta, "stock_after": stock_after, "reason": reason, "order_id": order_id}
+
+def record_movements(db: Session, movements: list[dict]) -> None:
+    if not movements:
+        return
+    now = int(time.time())
+    # executemany: um único INSERT preparado para todas as linhas
+    db.execute(insert(StockMovement), [{**m, "created_at": now} for m in movements])
+
+def movements_query(item_id: int, *, after_id: int | None = None, limit: int | None = None) -> Select:
+    stmt = select(StockMovement).where(StockMovement.item_id == item_id).order_by(StockMovement.id)
+    if after_id is not None:
+        stmt = stmt.where(StockMovement.id > after_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+async def list_movements_async(db: AsyncSession | Session, item_id: int, **filters) -> list[StockMovement]:
+    return await fetch_all(db, movements_query(item_id, **filters))
+
+async def stock_at_async(db: AsyncSession | Session, item_id: int, at: int) -> int:
+    # um seek em ix_stock_movements_item_created: o último movimento do item até a data
+    stock = await fetch_scalar(
+        db,
+        select(StockMovement.stock_after)
+        .where(StockMovement.item_id == item_id, StockMovement.created_at <= at)
+        .order_by(StockMovement.created_at.desc(), StockMovement.id.desc())
+        .limit(1),
+    )
+    if stock is None:
+        raise HTTPException(404, "Sem movimentos de estoque para o item até essa data.")
+    return stock
+
+def latest_snapshot_at(db: Session, at: int) -> int | None:
+    return db.scalar(select(func.max(StockSnapshot.taken_at)).where(StockSnapshot.taken_at <= at))
+
+def catalog_stock_at_query(base: int | None, at: int) -> Select:
+    # último snapshot até a data + movimentos entre ele e a data (um range scan em created_at)
+    moves = select(StockMovement.item_id, StockMovement.delta.label("stock")).where(StockMovement.created_at <= at)
+    if base is None:
+        parts = moves
+    else:
+        snapshot = select(StockSnapshot.item_id, StockSnapshot.stock).where(StockSnapshot.taken_at == base)
+        parts = union_all(snapshot, moves.where(StockMovement.created_at > base))
+    parts = parts.subquery()
+    return (
+        select(parts.c.item_id, func.sum(parts.c.stock).label("stock"))
+        .group_by(parts.c.item_id)
+        .order_by(parts.c.item_id)
+    )
+
+def take_snapshot(db: Session) -> tuple[int, int]:
+    # o snapshot é calculado a partir do próprio razão, com um atraso: transações que ainda
+    # não fizeram commit não podem ter movimentos com created_at anterior a taken_at
+    # (mínimo de 1s: created_at tem resolução de segundos)
+    taken_at = int(time.time()) - max(settings.STOCK_SNAPSHOT_LAG_SECONDS, 1)
+    base = latest_snapshot_at(db, taken_at)
+    if base == taken_at:
+        return taken_at, 0
+    rows = catalog_stock_at_query(base, taken_at).subquery()
+    result = db.execute(
+        insert(StockSnapshot).from_select(
+            ["taken_at", "item_id", "stock"],
+            select(literal(taken_at), rows.c.item_id, rows.c.stock),
+        )
+    )
+    db.commit()
+    return taken_at, result.rowcount
+
+def reconcile(db: Session, *, batch_size: int = 1000, deep: bool = False) -> Iterator[dict]:
+    # percorre os itens em lotes por id; cada lote é uma única query (leitura consistente)
+    # e a transação termina entre lotes para não segurar o snapshot de leitura
+    last = (
+        select(StockMovement.stock_after)
+        .where(StockMovement.item_id == Item.id)
+        .order_by(StockMovement.created_at.desc(), StockMovement.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    columns = [Item.id, Item.stock, last]
+    if deep:
+        # soma de todos os deltas: confere também o encadeamento dos stock_after
+        columns.append(select(func.sum(StockMovement.delta)).where(StockMovement.item_id == Item.id).scalar_subquery())
+
+    after_id = 0
+    while True:
+        rows = db.execute(select(*columns).where(Item.id > after_id).order_by(Item.id).limit(batch_size)).all()
+        db.rollback()
+        if not rows:
+            return
+        for row in rows:
+            item_id, stock, ledger = row[0], row[1], row[2]
+            total = row[3] if deep else ledger
+            if ledger != stock or total != stock:
+                yield {"item_id": item_id, "stock": stock, "ledger": ledger, "ledger_sum": total if deep else None}
+        after_id = rows[-1][0]
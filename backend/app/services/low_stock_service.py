@@ -0,0 +1,48 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy import Select, select
+
+from app.core.events import broker, publish_on_commit
+from app.db.reads import fetch_all
+from app.models.item import Item
+
+LOW_STOCK_TOPIC = "low_stock"
+
+def low_stock_query(*, after_id: int | None = None, limit: int | None = None, category_id: int | None = None) -> Select:
+    # o WHERE repete a condição do índice parcial ix_items_low_stock, senão o planner não o usa
+    stmt = select(Item).where(Item.stock <= Item.reorder_threshold).order_by(Item.id)
+    if after_id is not None:
+        stmt = stmt.where(Item.id > after_id)
+    if category_id is not None:
+        stmt = stmt.where(Item.category_id == category_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+async def list_low_stock_async(db: AsyncSession | Session, **filters) -> list[Item]:
+    return await fetch_all(db, low_stock_query(**filters))
+
+def track_stock_change(
+    db: Session,
+    item_id: int,
+    name: str,
+    *,
+    before: tuple[int, int] | None,
+    after: tuple[int, int],
+) -> None:
+    # before/after = (estoque, limite); só a travessia do limite vira evento
+    was_low = before is not None and before[0] <= before[1]
+    now_low = after[0] <= after[1]
+    if was_low == now_low:
+        return
+    publish_on_commit(db, LOW_STOCK_TOPIC, {
+        "type": "low" if now_low else "restocked",
+        "item_id": item_id,
+        "name": name,
+        "stock": after[0],
+        "reorder_threshold": after[1],
+    })
+
+def announce_resync() -> None:
+    # mudanças em lote (importação) não geram um evento por item: o cliente relê /items/low-stock
+    broker.publish(LOW_STOCK_TOPIC, {"type": "resync"})
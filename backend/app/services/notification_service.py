@@ -0,0 +1,52 @@
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.jobs import enqueue, job_handler
+from app.db.session import SessionLocal
+from app.models.order import Order
+from app.models.user import User
+
+# notificações de pedidos: enfileiradas na transação do pedido e enviadas pelos workers
+# da fila (app.core.jobs), fora do caminho da requisição
+
+ORDER_CREATED = "order.created"
+ORDER_STATUS_CHANGED = "order.status_changed"
+
+STATUS_MESSAGES = {"approved": "foi aprovado", "rejected": "foi rejeitado", "finished": "foi finalizado"}
+
+logger = logging.getLogger("electrostock.notifications")
+
+def order_created(db: Session, order_id: int, user_id: int) -> None:
+    enqueue(db, ORDER_CREATED, {"order_id": order_id, "user_id": user_id})
+
+def order_status_changed(db: Session, order_id: int, old_status: str, new_status: str) -> None:
+    enqueue(db, ORDER_STATUS_CHANGED, {"order_id": order_id, "from": old_status, "to": new_status})
+
+def send_notification(email: str, text: str) -> None:
+    # ponto de integração com o envio de e-mail; por enquanto só registra no log
+    logger.info("Notificação para %s: %s", email, text)
+
+def _order_owner(order_id: int):
+    with SessionLocal() as db:
+        return db.execute(
+            select(User.name, User.email).join(Order, Order.user_id == User.id).where(Order.id == order_id)
+        ).first()
+
+@job_handler(ORDER_CREATED)
+def notify_order_created(payload: dict) -> None:
+    owner = _order_owner(payload["order_id"])
+    if owner is None:
+        # pedido excluído antes da tarefa rodar
+        return
+    send_notification(settings.ADMIN_EMAIL, f"Novo pedido #{payload['order_id']} de {owner.name}.")
+
+@job_handler(ORDER_STATUS_CHANGED)
+def notify_status_changed(payload: dict) -> None:
+    message = STATUS_MESSAGES.get(payload["to"])
+    owner = _order_owner(payload["order_id"])
+    if message is None or owner is None:
+        return
+    send_notification(owner.email, f"Seu pedido #{payload['order_id']} {message}.")
@@ -0,0 +1,25 @@
+from sqlalchemy.orm import Session
+
+from app.core.events import publish_on_commit
+
+# deltas de pedidos para os clientes conectados (SSE/WebSocket): cada mudança vai para o canal
+# do dono do pedido e para o canal dos admins, só depois do commit; nenhum assinante consulta o banco
+
+ORDERS_ADMIN_TOPIC = "orders:admin"
+
+def user_orders_topic(user_id: int) -> str:
+    return f"orders:user:{user_id}"
+
+def _publish(db: Session, user_id: int, payload: dict) -> None:
+    publish_on_commit(db, user_orders_topic(user_id), payload)
+    publish_on_commit(db, ORDERS_ADMIN_TOPIC, payload)
+
+def order_created_event(db: Session, order: dict) -> None:
+    # pedido completo (mesmo formato de OrderOut): o cliente acrescenta à lista sem reler
+    _publish(db, order["user_id"], {"type": "created", "order": order})
+
+def order_status_event(db: Session, order_id: int, user_id: int, old_status: str, new_status: str) -> None:
+    _publish(db, user_id, {"type": "status", "order_id": order_id, "user_id": user_id, "status": new_status, "previous": old_status})
+
+def order_deleted_event(db: Session, order_id: int, user_id: int) -> None:
+    _publish(db, user_id, {"type": "deleted", "order_id": order_id, "user_id": user_id})
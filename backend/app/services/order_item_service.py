@@ -3,11 +3,28 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select
 
 from app.models.order_item import OrderItem
-from app.models.order import Order
-from app.models.item import Item
+from app.services.order_service import lock_pending_order
+from app.services.stock_service import reserve_stock, release_stock
+from app.services.summary_service import add_item_stats
 
-def list_order_items(db: Session) -> list[OrderItem]:
-    return list(db.scalars(select(OrderItem)))
+def list_order_items(
+    db: Session,
+    *,
+    after_id: int | None = None,
+    limit: int | None = None,
+    order_id: int | None = None,
+    item_id: int | None = None,
+) -> list[OrderItem]:
+    stmt = select(OrderItem).order_by(OrderItem.id)
+    if after_id is not None:
+        stmt = stmt.where(OrderItem.id > after_id)
+    if order_id is not None:
+        stmt = stmt.where(OrderItem.order_id == order_id)
+    if item_id is not None:
+        stmt = stmt.where(OrderItem.item_id == item_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return list(db.scalars(stmt))
 
 def get_order_item(db: Session, order_item_id: int) -> OrderItem:
     oi = db.get(OrderItem, order_item_id)
@@ -15,29 +32,29 @@ def get_order_item(db: Session, order_item_id: int) -> OrderItem:
         raise HTTPException(404, "OrderItem não encontrado.")
     return oi
 
+def _reload_locked(db: Session, order_item_id: int) -> OrderItem:
+    oi = db.get(OrderItem, order_item_id, populate_existing=True)
+    if not oi:
+        db.rollback()
+        raise HTTPException(404, "OrderItem não encontrado.")
+    return oi
+
 def update_order_item_quantity(db: Session, order_item_id: int, new_quantity: int) -> OrderItem:
     oi = get_order_item(db, order_item_id)
-    order = db.get(Order, oi.order_id)
-    if not order:
-        raise HTTPException(400, "Pedido inválido.")
-    if order.status != "pending":
-        raise HTTPException(400, "Só é possível alterar itens de pedidos pendentes.")
-
     if new_quantity <= 0:
         raise HTTPException(400, "Quantidade inválida.")
+    if not lock_pending_order(db, oi.order_id):
+        db.rollback()
+        raise HTTPException(400, "Só é possível alterar itens de pedidos pendentes.")
 
-    item = db.get(Item, oi.item_id)
-    if not item:
-        raise HTTPException(400, "Item inválido.")
-
-    # ajustar estoque pela diferença
+    # quantidade relida com o pedido travado: outra edição da mesma linha pode ter commitado antes
+    oi = _reload_locked(db, order_item_id)
     diff = new_quantity - oi.quantity
     if diff > 0:
-        if diff > item.stock:
-            raise HTTPException(400, "Estoque insuficiente para aumentar a quantidade.")
-        item.stock -= diff
+        reserve_stock(db, {oi.item_id: diff}, order_id=oi.order_id)
     elif diff < 0:
-        item.stock += (-diff)
+        release_stock(db, {oi.item_id: -diff}, order_id=oi.order_id)
+    add_item_stats(db, requested={oi.item_id: diff}, consumed={oi.item_id: diff})
 
     oi.quantity = new_quantity
     db.commit()
@@ -46,13 +63,13 @@ def update_order_item_quantity(db: Session, order_item_id: int, new_quantity: in
 
 def delete_order_item(db: Session, order_item_id: int) -> None:
     oi = get_order_item(db, order_item_id)
-    order = db.get(Order, oi.order_id)
-    if not order or order.status != "pending":
+    if not lock_pending_order(db, oi.order_id):
+        db.rollback()
         raise HTTPException(400, "Só é possível remover itens de pedidos pendentes.")
 
-    item = db.get(Item, oi.item_id)
-    if item:
-        item.stock += oi.quantity
+    oi = _reload_locked(db, order_item_id)
+    release_stock(db, {oi.item_id: oi.quantity}, order_id=oi.order_id)
+    add_item_stats(db, requested={oi.item_id: -oi.quantity}, consumed={oi.item_id: -oi.quantity})
 
     db.delete(oi)
     db.commit()
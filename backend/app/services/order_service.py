@@ -1,41 +1,94 @@
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import Select, func, select, update
 
+from app.db.reads import fetch_all, fetch_by_id
 from app.models.order import Order
 from app.models.order_item import OrderItem
-from app.models.item import Item
+from app.services.idempotency_service import save_idempotent_response
+from app.services.notification_service import order_created, order_status_changed
+from app.services.order_feed_service import order_created_event, order_status_event, order_deleted_event
+from app.services.stock_service import aggregate_quantities, reserve_stock, release_stock
+from app.services.summary_service import add_item_stats, add_status_counts, negate
+
+# status de destino -> status exigido para a transição
+STATUS_TRANSITIONS = {"approved": "pending", "rejected": "pending", "finished": "approved"}
+
+def order_line_quantities(order: Order) -> dict[int, int]:
+    return aggregate_quantities([{"item_id": oi.item_id, "quantity": oi.quantity} for oi in order.items])
 
 def get_order(db: Session, order_id: int) -> Order:
-    order = db.get(Order, order_id)
+    order = db.get(Order, order_id, options=[selectinload(Order.items)])
+    if not order:
+        raise HTTPException(404, "Pedido não encontrado.")
+    return order
+
+async def get_order_async(db: AsyncSession | Session, order_id: int) -> Order:
+    order = await fetch_by_id(db, Order, order_id, options=[selectinload(Order.items)])
     if not order:
         raise HTTPException(404, "Pedido não encontrado.")
     return order
 
-def list_orders_all(db: Session) -> list[Order]:
-    return list(db.scalars(select(Order)))
+def orders_query(
+    *,
+    after_id: int | None = None,
+    limit: int | None = None,
+    status: str | None = None,
+    user_id: int | None = None,
+) -> Select:
+    # linhas carregadas em uma única query extra (evita N+1 ao serializar)
+    stmt = select(Order).options(selectinload(Order.items)).order_by(Order.id)
+    if after_id is not None:
+        stmt = stmt.where(Order.id > after_id)
+    if status is not None:
+        stmt = stmt.where(Order.status == status)
+    if user_id is not None:
+        stmt = stmt.where(Order.user_id == user_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+def list_orders_all(db: Session, **filters) -> list[Order]:
+    return list(db.scalars(orders_query(**filters)))
+
+async def list_orders_all_async(db: AsyncSession | Session, **filters) -> list[Order]:
+    return await fetch_all(db, orders_query(**filters))
 
-def list_orders_for_user(db: Session, user_id: int) -> list[Order]:
-    return list(db.scalars(select(Order).where(Order.user_id == user_id)))
+def list_orders_for_user(db: Session, user_id: int, **filters) -> list[Order]:
+    return list_orders_all(db, user_id=user_id, **filters)
 
-def create_order(db: Session, user_id: int, items: list[dict]) -> Order:
+async def list_orders_for_user_async(db: AsyncSession | Session, user_id: int, **filters) -> list[Order]:
+    return await list_orders_all_async(db, user_id=user_id, **filters)
+
+def create_order(db: Session, user_id: int, items: list[dict], idempotency_key: str | None = None) -> Order:
     if not items:
         raise HTTPException(400, "O pedido precisa ter ao menos 1 item.")
 
+    quantities = aggregate_quantities(items)
     order = Order(user_id=user_id, status="pending")
     db.add(order)
-    db.flush() 
+    db.flush()
+
+    # depois do flush: os movimentos do razão referenciam o id do pedido
+    reserve_stock(db, quantities, order_id=order.id)
+    add_status_counts(db, {"pending": 1})
+    add_item_stats(db, requested=quantities, consumed=quantities)
 
     for oi in items:
-        item = db.get(Item, oi["item_id"])
-        if not item:
-            raise HTTPException(400, f"Item {oi['item_id']} não encontrado.")
-        if oi["quantity"] <= 0:
-            raise HTTPException(400, "Quantidade inválida.")
-        if oi["quantity"] > item.stock:
-            raise HTTPException(400, f"Estoque insuficiente para '{item.name}'.")
-        item.stock -= oi["quantity"]
-        db.add(OrderItem(order_id=order.id, item_id=item.id, quantity=oi["quantity"]))
+        db.add(OrderItem(order_id=order.id, item_id=oi["item_id"], quantity=oi["quantity"]))
+    order_created(db, order.id, user_id)
+
+    body = {
+        "id": order.id,
+        "user_id": user_id,
+        "status": order.status,
+        "items": [{"item_id": oi["item_id"], "quantity": oi["quantity"]} for oi in items],
+    }
+    order_created_event(db, body)
+    if idempotency_key is not None:
+        # mesma transação do pedido: ou os dois ficam gravados, ou nenhum
+        save_idempotent_response(db, user_id, idempotency_key, body)
 
     db.commit()
     db.refresh(order)
@@ -43,31 +96,122 @@ def create_order(db: Session, user_id: int, items: list[dict]) -> Order:
 
 def set_status(db: Session, order_id: int, new_status: str, only_if: str | None = None, restore_stock_on_reject: bool = True) -> Order:
     order = get_order(db, order_id)
-    if only_if and order.status != only_if:
+    old_status = order.status
+    if only_if and old_status != only_if:
         raise HTTPException(400, f"Só é possível mudar status quando estiver '{only_if}'.")
+    restore = new_status == "rejected" and restore_stock_on_reject
+    if restore and old_status != "pending":
+        raise HTTPException(400, "Só é possível rejeitar pedidos pendentes.")
+    if old_status == new_status:
+        return order
 
-    if new_status == "rejected" and restore_stock_on_reject:
-        if order.status != "pending":
-            raise HTTPException(400, "Só é possível rejeitar pedidos pendentes.")
-        for oi in order.items:
-            item = db.get(Item, oi.item_id)
-            if item:
-                item.stock += oi.quantity
+    # o WHERE repete o status lido: com chamadas concorrentes só uma faz a transição, e só ela
+    # devolve estoque, mexe nos contadores e anuncia a mudança
+    changed = db.scalar(
+        update(Order)
+        .where(Order.id == order_id, Order.status == old_status)
+        .values(status=new_status)
+        .returning(Order.id)
+        .execution_options(synchronize_session=False)
+    )
+    if changed is None:
+        db.rollback()
+        raise HTTPException(400, f"Só é possível mudar status quando estiver '{old_status}'.")
 
-    order.status = new_status
+    if restore:
+        quantities = order_line_quantities(order)
+        release_stock(db, quantities, order_id=order.id)
+        add_item_stats(db, consumed=negate(quantities))
+    add_status_counts(db, {old_status: -1, new_status: 1})
+    order_status_changed(db, order.id, old_status, new_status)
+    order_status_event(db, order.id, order.user_id, old_status, new_status)
     db.commit()
     db.refresh(order)
     return order
 
+def set_status_bulk(db: Session, order_ids: list[int], new_status: str) -> list[dict]:
+    required = STATUS_TRANSITIONS.get(new_status)
+    if required is None:
+        raise HTTPException(400, "Status inválido.")
+
+    ids = list(dict.fromkeys(order_ids))
+    rows = db.execute(select(Order.id, Order.status, Order.user_id).where(Order.id.in_(ids))).all()
+    current = {order_id: status for order_id, status, _ in rows}
+    owners = {order_id: user_id for order_id, _, user_id in rows}
+    eligible = [order_id for order_id in ids if current.get(order_id) == required]
+
+    changed: set[int] = set()
+    if eligible:
+        # o WHERE repete a pré-condição: pedidos alterados por outra transação no meio
+        # do caminho ficam de fora, e o RETURNING diz exatamente quais mudaram
+        changed = set(db.scalars(
+            update(Order)
+            .where(Order.id.in_(eligible), Order.status == required)
+            .values(status=new_status)
+            .returning(Order.id)
+            .execution_options(synchronize_session=False)
+        ))
+
+    if new_status == "rejected" and changed:
+        totals = db.execute(
+            select(OrderItem.item_id, func.sum(OrderItem.quantity))
+            .where(OrderItem.order_id.in_(changed))
+            .group_by(OrderItem.item_id)
+        ).all()
+        quantities = {item_id: qty for item_id, qty in totals}
+        # um movimento por item com o total do lote (sem order_id): um UPDATE por item, não por linha
+        release_stock(db, quantities)
+        add_item_stats(db, consumed=negate(quantities))
+
+    if changed:
+        add_status_counts(db, {required: -len(changed), new_status: len(changed)})
+        for order_id in sorted(changed):
+            order_status_changed(db, order_id, required, new_status)
+            order_status_event(db, order_id, owners[order_id], required, new_status)
+
+    db.commit()
+
+    outcomes = []
+    for order_id in ids:
+        if order_id in changed:
+            outcomes.append({"order_id": order_id, "ok": True, "status": new_status})
+        elif order_id not in current:
+            outcomes.append({"order_id": order_id, "ok": False, "detail": "Pedido não encontrado."})
+        else:
+            outcomes.append({
+                "order_id": order_id,
+                "ok": False,
+                "status": current[order_id],
+                "detail": f"Só é possível mudar status quando estiver '{required}'.",
+            })
+    return outcomes
+
+def lock_pending_order(db: Session, order_id: int) -> bool:
+    # UPDATE sem efeito com a mesma condição de set_status: só casa se o pedido ainda está pendente
+    # e segura a linha (no SQLite, o banco) até o commit, então uma aprovação concorrente ou já
+    # aconteceu (e aqui não casa) ou espera este commit
+    locked = db.scalar(
+        update(Order)
+        .where(Order.id == order_id, Order.status == "pending")
+        .values(status=Order.status)
+        .returning(Order.id)
+        .execution_options(synchronize_session=False)
+    )
+    return locked is not None
+
 def delete_order(db: Session, order_id: int):
     order = get_order(db, order_id)
-    if order.status != "pending":
+    if order.status != "pending" or not lock_pending_order(db, order_id):
+        db.rollback()
         raise HTTPException(400, "Só é possível excluir pedidos pendentes.")
 
-    for oi in order.items:
-        item = db.get(Item, oi.item_id)
-        if item:
-            item.stock += oi.quantity
+    # linhas relidas depois da trava: uma edição concorrente já commitada entra na conta
+    db.expire(order, ["items"])
+    quantities = order_line_quantities(order)
+    release_stock(db, quantities, order_id=order.id)
+    add_status_counts(db, {"pending": -1})
+    add_item_stats(db, requested=negate(quantities), consumed=negate(quantities))
+    order_deleted_event(db, order.id, order.user_id)
 
     db.delete(order)
     db.commit()
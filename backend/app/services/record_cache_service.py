@@ -0,0 +1,41 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import make_cache
+from app.core.config import settings
+
+# snapshots (dicts) de categorias e itens; nunca objetos ORM, que pertencem a uma sessão
+category_cache = make_cache("category", settings.CATALOG_CACHE_SIZE, settings.CATALOG_CACHE_TTL_SECONDS, settings.CACHE_REDIS_URL)
+item_cache = make_cache("item", settings.CATALOG_CACHE_SIZE, settings.CATALOG_CACHE_TTL_SECONDS, settings.CACHE_REDIS_URL)
+
+ALL_CATEGORIES_KEY = "all"
+
+def category_snapshot(cat) -> dict:
+    return {"id": cat.id, "name": cat.name}
+
+def item_snapshot(item) -> dict:
+    return {
+        "id": item.id,
+        "name": item.name,
+        "description": item.description,
+        "stock": item.stock,
+        "category_id": item.category_id,
+        "reorder_threshold": item.reorder_threshold,
+    }
+
+def invalidate_on_commit(db: Session, cache, *keys) -> None:
+    # remover só depois do commit: antes disso um leitor concorrente poderia
+    # repopular o cache com o valor antigo ainda visível no banco
+    db.info.setdefault("cache_invalidations", []).extend((cache, key) for key in keys)
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session) -> None:
+    for cache, key in session.info.pop("cache_invalidations", []):
+        cache.delete(key)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_invalidations(session: Session, previous_transaction) -> None:
+    session.info.pop("cache_invalidations", None)
+
+def cache_stats() -> dict:
+    return {"category": category_cache.stats(), "item": item_cache.stats()}
@@ -0,0 +1,61 @@
+import re
+
+from sqlalchemy import Select, column, or_, select, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.reads import fetch_all
+from app.models.item import Item
+
+# peso do nome x descrição no bm25 (menor = mais relevante)
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+items_fts = table("items_fts", column("rowid"))
+
+_fts_enabled = False
+
+def detect_search_index(engine: Engine) -> None:
+    # o índice é criado pela migração 0004; aqui só descobre se ele existe
+    global _fts_enabled
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.connect() as conn:
+        exists = conn.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE name = 'items_fts'").first()
+    _fts_enabled = exists is not None
+
+def _terms(query: str) -> list[str]:
+    return re.findall(r"\w+", query)
+
+def search_query(query: str, *, limit: int, category_id: int | None = None, dialect: str = "sqlite") -> Select | None:
+    terms = _terms(query)
+    if not terms:
+        return None
+
+    if _fts_enabled and dialect == "sqlite":
+        # cada termo vira prefixo ("esp"*), todos obrigatórios
+        match = " ".join(f'"{t}"*' for t in terms)
+        stmt = (
+            select(Item)
+            .join(items_fts, items_fts.c.rowid == Item.id)
+            .where(text("items_fts MATCH :match").bindparams(match=match))
+            .order_by(text(f"bm25(items_fts, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT})"))
+        )
+    else:
+        stmt = select(Item).order_by(Item.name)
+        for t in terms:
+            pattern = f"%{t}%"
+            stmt = stmt.where(or_(Item.name.ilike(pattern), Item.description.ilike(pattern)))
+
+    if category_id is not None:
+        stmt = stmt.where(Item.category_id == category_id)
+    return stmt.limit(limit)
+
+def search_items(db: Session, query: str, *, limit: int = 20, category_id: int | None = None) -> list[Item]:
+    stmt = search_query(query, limit=limit, category_id=category_id, dialect=db.get_bind().dialect.name)
+    return list(db.scalars(stmt)) if stmt is not None else []
+
+async def search_items_async(db: AsyncSession | Session, query: str, *, limit: int = 20, category_id: int | None = None) -> list[Item]:
+    stmt = search_query(query, limit=limit, category_id=category_id, dialect=db.get_bind().dialect.name)
+    return await fetch_all(db, stmt) if stmt is not None else []
@@ -0,0 +1,85 @@
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy import select, update
+
+from app.models.item import Item
+from app.services.ledger_service import movement, record_movements
+from app.services.low_stock_service import track_stock_change
+from app.services.record_cache_service import item_cache, invalidate_on_commit
+
+def aggregate_quantities(lines: list[dict]) -> dict[int, int]:
+    totals: dict[int, int] = {}
+    for line in lines:
+        if line["quantity"] <= 0:
+            raise HTTPException(400, "Quantidade inválida.")
+        totals[line["item_id"]] = totals.get(line["item_id"], 0) + line["quantity"]
+    return totals
+
+def load_items(db: Session, item_ids, *, for_update: bool = False) -> dict[int, Item]:
+    stmt = select(Item).where(Item.id.in_(sorted(item_ids))).order_by(Item.id)
+    if for_update:
+        # ignorado pelo SQLite; no Postgres trava as linhas na mesma ordem (evita deadlock)
+        stmt = stmt.with_for_update()
+    return {item.id: item for item in db.scalars(stmt)}
+
+def reserve_stock(db: Session, quantities: dict[int, int], *, order_id: int | None = None) -> dict[int, Item]:
+    items = load_items(db, quantities, for_update=True)
+    for item_id in quantities:
+        if item_id not in items:
+            db.rollback()
+            raise HTTPException(400, f"Item {item_id} não encontrado.")
+
+    # decremento condicional: a checagem e a baixa acontecem no mesmo UPDATE,
+    # em ordem crescente de id para que transações concorrentes não se travem
+    movements = []
+    for item_id in sorted(quantities):
+        qty = quantities[item_id]
+        row = db.execute(
+            update(Item)
+            .where(Item.id == item_id, Item.stock >= qty)
+            .values(stock=Item.stock - qty)
+            .returning(Item.name, Item.stock, Item.reorder_threshold)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if row is None:
+            name = items[item_id].name
+            db.rollback()
+            raise HTTPException(400, f"Estoque insuficiente para '{name}'.")
+        track_stock_change(
+            db, item_id, row.name, before=(row.stock + qty, row.reorder_threshold), after=(row.stock, row.reorder_threshold)
+        )
+        movements.append(movement(item_id, -qty, row.stock, "reserve", order_id))
+
+    record_movements(db, movements)
+    _expire_stock(db, quantities)
+    invalidate_on_commit(db, item_cache, *quantities)
+    return items
+
+def release_stock(db: Session, quantities: dict[int, int], *, order_id: int | None = None) -> None:
+    movements = []
+    for item_id in sorted(quantities):
+        qty = quantities[item_id]
+        row = db.execute(
+            update(Item)
+            .where(Item.id == item_id)
+            .values(stock=Item.stock + qty)
+            .returning(Item.name, Item.stock, Item.reorder_threshold)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if row is not None:
+            track_stock_change(
+                db, item_id, row.name, before=(row.stock - qty, row.reorder_threshold), after=(row.stock, row.reorder_threshold)
+            )
+            movements.append(movement(item_id, qty, row.stock, "release", order_id))
+    record_movements(db, movements)
+    _expire_stock(db, quantities)
+    if quantities:
+        invalidate_on_commit(db, item_cache, *quantities)
+
+def _expire_stock(db: Session, item_ids) -> None:
+    # os UPDATEs acima não passam pelo ORM; força recarregar o estoque dos objetos em memória
+    for item_id in item_ids:
+        item = db.identity_map.get(identity_key(Item, item_id))
+        if item is not None:
+            db.expire(item, ["stock"])
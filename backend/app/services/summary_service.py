@@ -0,0 +1,96 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.db.reads import fetch_all, fetch_rows
+from app.models.category import Category
+from app.models.item import Item
+from app.models.order_summary import OrderStatusCount, ItemOrderStat
+
+ORDER_STATUSES = ("pending", "approved", "rejected", "finished")
+
+# os contadores só recebem incrementos relativos (count = count + delta) na transação de quem
+# escreveu o pedido: escritas concorrentes não se sobrescrevem e um rollback desfaz os dois juntos
+
+def _increment_statement(db: Session, model, key: str, columns: list[str]):
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        stmt = sqlite_insert(model)
+    elif dialect == "postgresql":
+        stmt = pg_insert(model)
+    else:
+        return None
+    return stmt.on_conflict_do_update(
+        index_elements=[getattr(model, key)],
+        set_={col: getattr(model, col) + stmt.excluded[col] for col in columns},
+    )
+
+def _increment(db: Session, model, key: str, columns: list[str], rows: list[dict]) -> None:
+    rows = [row for row in rows if any(row[col] for col in columns)]
+    if not rows:
+        return
+    stmt = _increment_statement(db, model, key, columns)
+    if stmt is not None:
+        db.execute(stmt, rows)
+        return
+    for row in rows:
+        result = db.execute(
+            update(model)
+            .where(getattr(model, key) == row[key])
+            .values({col: getattr(model, col) + row[col] for col in columns})
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            db.execute(insert(model).values(**row))
+
+def add_status_counts(db: Session, deltas: dict[str, int]) -> None:
+    _increment(db, OrderStatusCount, "status", ["count"], [
+        {"status": status, "count": delta} for status, delta in deltas.items()
+    ])
+
+def add_item_stats(
+    db: Session,
+    *,
+    requested: dict[int, int] | None = None,
+    consumed: dict[int, int] | None = None,
+) -> None:
+    requested = requested or {}
+    consumed = consumed or {}
+    _increment(db, ItemOrderStat, "item_id", ["requested", "consumed"], [
+        {"item_id": item_id, "requested": requested.get(item_id, 0), "consumed": consumed.get(item_id, 0)}
+        for item_id in sorted(requested.keys() | consumed.keys())
+    ])
+
+def negate(quantities: dict[int, int]) -> dict[int, int]:
+    return {item_id: -qty for item_id, qty in quantities.items()}
+
+async def orders_by_status_async(db: AsyncSession | Session) -> dict[str, int]:
+    counts = {status: 0 for status in ORDER_STATUSES}
+    for row in await fetch_all(db, select(OrderStatusCount)):
+        counts[row.status] = row.count
+    return counts
+
+async def top_items_async(db: AsyncSession | Session, *, limit: int) -> list[dict]:
+    stmt = (
+        select(ItemOrderStat.item_id, Item.name, ItemOrderStat.requested, ItemOrderStat.consumed)
+        .join(Item, Item.id == ItemOrderStat.item_id)
+        .where(ItemOrderStat.requested > 0)
+        .order_by(ItemOrderStat.requested.desc(), ItemOrderStat.item_id)
+        .limit(limit)
+    )
+    return [row._asdict() for row in await fetch_rows(db, stmt)]
+
+async def consumption_by_category_async(db: AsyncSession | Session) -> list[dict]:
+    # agrega a tabela de resumo (uma linha por item já pedido), não as linhas de pedido;
+    # o item pode mudar de categoria, por isso a soma por categoria não é materializada
+    consumed = func.sum(ItemOrderStat.consumed).label("consumed")
+    stmt = (
+        select(Category.id.label("category_id"), Category.name, consumed)
+        .join(Item, Item.category_id == Category.id)
+        .join(ItemOrderStat, ItemOrderStat.item_id == Item.id)
+        .group_by(Category.id, Category.name)
+        .order_by(consumed.desc(), Category.id)
+    )
+    return [row._asdict() for row in await fetch_rows(db, stmt)]
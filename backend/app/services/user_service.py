@@ -1,9 +1,12 @@
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import exists, select, update
 
 from app.models.user import User
-from app.core.security import hash_password, verify_password
+from app.models.order import Order
+from app.core.security import hash_password, hash_password_async, verify_and_update_password_async
+from app.core.principal_cache import invalidate_principal
 
 def get_user_by_email(db: Session, email: str) -> User | None:
     return db.scalar(select(User).where(User.email == email))
@@ -14,40 +17,98 @@ def get_user(db: Session, user_id: int) -> User:
         raise HTTPException(404, "Usuário não encontrado.")
     return user
 
-def list_users(db: Session) -> list[User]:
-    return list(db.scalars(select(User)))
+def list_users(db: Session, *, after_id: int | None = None, limit: int | None = None, role: str | None = None) -> list[User]:
+    stmt = select(User).order_by(User.id)
+    if after_id is not None:
+        stmt = stmt.where(User.id > after_id)
+    if role is not None:
+        stmt = stmt.where(User.role == role)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return list(db.scalars(stmt))
 
-def create_user(db: Session, name: str, email: str, password: str, role: str = "user") -> User:
-    if get_user_by_email(db, email):
-        raise HTTPException(400, "Esse email já está registrado.")
-    user = User(name=name, email=email, password_hash=hash_password(password), role=role)
+# as versões async são das rotas: o bcrypt é aguardado no event loop e só as idas ao banco
+# passam pelo threadpool. A sessão é fechada antes do hash para a conexão voltar ao pool:
+# uma rajada de logins não prende threads nem conexões das outras rotas
+
+def _ensure_email_free(db: Session, email: str) -> None:
+    try:
+        if get_user_by_email(db, email):
+            raise HTTPException(400, "Esse email já está registrado.")
+    finally:
+        db.close()
+
+def _insert_user(db: Session, user: User) -> User:
     db.add(user)
     db.commit()
     db.refresh(user)
     return user
 
-def authenticate_user(db: Session, email: str, password: str) -> User:
-    user = get_user_by_email(db, email)
-    if not user or not verify_password(password, user.password_hash):
+def create_user(db: Session, name: str, email: str, password: str, role: str = "user") -> User:
+    if get_user_by_email(db, email):
+        raise HTTPException(400, "Esse email já está registrado.")
+    return _insert_user(db, User(name=name, email=email, password_hash=hash_password(password), role=role))
+
+async def create_user_async(db: Session, name: str, email: str, password: str, role: str = "user") -> User:
+    await run_in_threadpool(_ensure_email_free, db, email)
+    password_hash = await hash_password_async(password)
+    return await run_in_threadpool(_insert_user, db, User(name=name, email=email, password_hash=password_hash, role=role))
+
+def _find_login_user(db: Session, email: str) -> User | None:
+    try:
+        # o objeto sai da sessão já carregado: basta para o token e para conferir a senha
+        return get_user_by_email(db, email)
+    finally:
+        db.close()
+
+def _store_password_hash(db: Session, user_id: int, password_hash: str) -> None:
+    db.execute(update(User).where(User.id == user_id).values(password_hash=password_hash))
+    db.commit()
+
+async def authenticate_user_async(db: Session, email: str, password: str) -> User:
+    user = await run_in_threadpool(_find_login_user, db, email)
+    if not user:
         raise HTTPException(401, "Email ou senha inválidos.")
+    ok, new_hash = await verify_and_update_password_async(password, user.password_hash)
+    if not ok:
+        raise HTTPException(401, "Email ou senha inválidos.")
+    if new_hash:
+        await run_in_threadpool(_store_password_hash, db, user.id, new_hash)
+        user.password_hash = new_hash
     return user
 
-def update_profile(db: Session, user: User, new_email: str | None, new_password: str | None, admin_email_reserved: str):
-    if new_email:
+def _check_profile_email(db: Session, user_id: int, new_email: str | None, admin_email_reserved: str) -> None:
+    try:
+        user = get_user(db, user_id)
+        if not new_email:
+            return
         if new_email == admin_email_reserved and user.email != admin_email_reserved:
             raise HTTPException(400, "Email reservado para o administrador.")
         if new_email != user.email and get_user_by_email(db, new_email):
             raise HTTPException(400, "Já existe usuário com este email.")
-        user.email = new_email
+    finally:
+        db.close()
 
-    if new_password:
-        user.password_hash = hash_password(new_password)
+def _save_profile(db: Session, user_id: int, new_email: str | None, password_hash: str | None) -> User:
+    user = get_user(db, user_id)
+    old_email = user.email
+    if new_email:
+        user.email = new_email
+    if password_hash:
+        user.password_hash = password_hash
 
     db.commit()
+    invalidate_principal(old_email)
     db.refresh(user)
     return user
 
+async def update_profile_async(db: Session, user_id: int, new_email: str | None, new_password: str | None, admin_email_reserved: str) -> User:
+    await run_in_threadpool(_check_profile_email, db, user_id, new_email, admin_email_reserved)
+    password_hash = await hash_password_async(new_password) if new_password else None
+    return await run_in_threadpool(_save_profile, db, user_id, new_email, password_hash)
+
 def admin_update_user(db: Session, user: User, *, name: str | None, email: str | None, role: str | None, admin_email_reserved: str):
+    old_email = user.email
     if email:
         if email == admin_email_reserved and user.email != admin_email_reserved:
             raise HTTPException(400, "Email reservado para o administrador.")
@@ -63,6 +124,7 @@ def admin_update_user(db: Session, user: User, *, name: str | None, email: str |
         user.role = role
 
     db.commit()
+    invalidate_principal(old_email)
     db.refresh(user)
     return user
 
@@ -70,5 +132,9 @@ def delete_user(db: Session, user_id: int, admin_email_reserved: str):
     user = get_user(db, user_id)
     if user.email == admin_email_reserved:
         raise HTTPException(400, "Não é permitido remover o administrador principal.")
+    if db.scalar(select(exists().where(Order.user_id == user_id))):
+        raise HTTPException(400, "Não é possível remover usuário com pedidos.")
+    email = user.email
     db.delete(user)
     db.commit()
+    invalidate_principal(email)
@@ -0,0 +1,42 @@
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.reads import fetch_scalar
+from app.models.stock_ledger import StockMovement
+from app.models.table_version import TableVersion
+
+# "items" conta só edições de catálogo (cadastro, edição, remoção, importação); o estoque
+# movido por pedidos tem versão própria, lida do razão (get_stock_version_async)
+VERSIONED_TABLES = ("items", "categories")
+
+table_versions = TableVersion.__table__
+
+def ensure_versions(db: Session) -> None:
+    existing = set(db.scalars(select(table_versions.c.name)))
+    missing = [{"name": name, "version": 0} for name in VERSIONED_TABLES if name not in existing]
+    if missing:
+        db.execute(insert(table_versions), missing)
+        db.commit()
+
+def bump_version(db: Session, name: str) -> None:
+    result = db.execute(
+        update(table_versions)
+        .where(table_versions.c.name == name)
+        .values(version=table_versions.c.version + 1)
+    )
+    if result.rowcount == 0:
+        # linha ainda não semeada (ensure_versions roda no startup)
+        db.execute(insert(table_versions).values(name=name, version=1))
+
+async def get_version_async(db: AsyncSession | Session, name: str) -> int:
+    version = await fetch_scalar(db, select(table_versions.c.version).where(table_versions.c.name == name))
+    return version or 0
+
+async def get_stock_version_async(db: AsyncSession | Session, item_id: int | None = None) -> int:
+    # toda mudança de estoque grava um movimento na mesma transação: o último id do razão é a
+    # versão, sem um contador que todos os checkouts teriam de atualizar na mesma linha
+    stmt = select(func.max(StockMovement.id))
+    if item_id is not None:
+        stmt = stmt.where(StockMovement.item_id == item_id)
+    return await fetch_scalar(db, stmt) or 0
@@ -0,0 +1,76 @@
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+from sqlalchemy import text
+
+from app.db.base import Base
+from app.db.session import engine
+from app.main import app  # noqa: F401  (registra modelos)
+
+# consultas dos caminhos quentes, com os mesmos filtros e ordenação que os serviços usam
+QUERIES = {
+    "pedidos do usuário": "SELECT id, status FROM orders WHERE user_id = :user_id AND id > 0 ORDER BY id LIMIT 100",
+    "pedidos por status": "SELECT id, user_id FROM orders WHERE status = 'pending' AND id > 0 ORDER BY id LIMIT 100",
+    "linhas do pedido": "SELECT id, item_id, quantity FROM order_items WHERE order_id = :order_id",
+    "item em uso (exclusão)": "SELECT 1 FROM order_items WHERE item_id = :item_id LIMIT 1",
+    "itens da categoria": "SELECT id, name FROM items WHERE category_id = :category_id AND id > 0 ORDER BY id LIMIT 100",
+    "estoque baixo": "SELECT id, stock FROM items WHERE stock <= 20 ORDER BY stock LIMIT 100",
+    "usuários por papel": "SELECT id, email FROM users WHERE role = 'admin' AND id > 0 ORDER BY id LIMIT 100",
+}
+
+def hot_indexes() -> list[str]:
+    return [ix.name for table in Base.metadata.sorted_tables for ix in table.indexes if not ix.unique]
+
+def sample_params(conn) -> dict:
+    return {
+        "user_id": conn.execute(text("SELECT user_id FROM orders ORDER BY id DESC LIMIT 1")).scalar() or 1,
+        "order_id": conn.execute(text("SELECT max(id) FROM orders")).scalar() or 1,
+        "item_id": conn.execute(text("SELECT max(id) FROM items")).scalar() or 1,
+        "category_id": conn.execute(text("SELECT category_id FROM items ORDER BY id DESC LIMIT 1")).scalar() or 1,
+    }
+
+def measure(conn, params: dict, repeat: int, tag: str) -> dict:
+    result = {}
+    for name, sql in QUERIES.items():
+        # o comentário muda o texto do SQL e evita reaproveitar o plano em cache do pysqlite
+        sql = f"{sql} /* {tag} */"
+        plan = " / ".join(row[-1] for row in conn.execute(text("EXPLAIN QUERY PLAN " + sql), params))
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(text(sql), params).fetchall()
+            timings.append(time.perf_counter() - start)
+        result[name] = (statistics.median(timings) * 1000, plan)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Planos e latência das consultas quentes, com e sem os índices compostos.")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        params = sample_params(conn)
+        with_indexes = measure(conn, params, args.repeat, "com índices")
+
+        # DDL no SQLite é transacional: remove os índices, mede e desfaz com rollback.
+        # o BEGIN explícito é necessário porque o pysqlite não abre transação antes de DDL
+        conn.rollback()
+        conn.exec_driver_sql("BEGIN")
+        for name in hot_indexes():
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+        without_indexes = measure(conn, params, args.repeat, "sem índices")
+        conn.rollback()
+
+    for name in QUERIES:
+        ms_with, plan_with = with_indexes[name]
+        ms_without, plan_without = without_indexes[name]
+        print(f"{name}: {ms_without:.3f} ms -> {ms_with:.3f} ms")
+        print(f"    sem índice: {plan_without}")
+        print(f"    com índice: {plan_with}")
+
+if __name__ == "__main__":
+    main()
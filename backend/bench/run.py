@@ -0,0 +1,219 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+import httpx
+
+from bench.seed import BENCH_PASSWORD, PART_NAMES, bench_email
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    def record(self, name: str, seconds: float, ok: bool) -> None:
+        self.latencies[name].append(seconds)
+        if not ok:
+            self.errors[name] += 1
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    routes = {}
+    for name, values in sorted(recorder.latencies.items()):
+        values = sorted(values)
+        routes[name] = {
+            "count": len(values),
+            "errors": recorder.errors.get(name, 0),
+            "rps": len(values) / elapsed,
+            "mean_ms": sum(values) / len(values) * 1000,
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+        }
+    total = sum(r["count"] for r in routes.values())
+    return {"total": {"requests": total, "seconds": elapsed, "rps": total / elapsed}, "routes": routes}
+
+class Workload:
+    def __init__(self, client: httpx.AsyncClient, args, rnd: random.Random):
+        self.client = client
+        self.args = args
+        self.rnd = rnd
+        self.item_ids: list[int] = []
+        self.admin_headers: dict = {}
+        self.user_headers: list[dict] = []
+        self.pending_orders: list[int] = []
+
+    async def prepare(self) -> None:
+        r = await self.client.post("/auth/login-json", json={"email": self.args.admin_email, "password": self.args.admin_password})
+        r.raise_for_status()
+        self.admin_headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        for i in range(min(self.args.users, self.args.concurrency)):
+            r = await self.client.post("/auth/login-json", json={"email": bench_email(i), "password": BENCH_PASSWORD})
+            r.raise_for_status()
+            self.user_headers.append({"Authorization": f"Bearer {r.json()['access_token']}"})
+        r = await self.client.get("/items", params={"limit": 1000})
+        self.item_ids = [item["id"] for item in r.json()]
+
+    # cada operação devolve (nome da rota, resposta)
+    async def browse_items(self):
+        return "GET /items", await self.client.get("/items", params={"limit": 50, "after_id": self.rnd.choice(self.item_ids)})
+
+    async def item_detail(self):
+        return "GET /items/{id}", await self.client.get(f"/items/{self.rnd.choice(self.item_ids)}")
+
+    async def search(self):
+        return "GET /items/search", await self.client.get("/items/search", params={"q": self.rnd.choice(PART_NAMES)[:4]})
+
+    async def categories(self):
+        return "GET /categories", await self.client.get("/categories")
+
+    async def login(self):
+        # só usuários que já logaram no prepare: o hash semeado (custo 4) já foi refeito com o custo
+        # configurado, então o login medido não inclui o rehash do primeiro acesso
+        i = self.rnd.randrange(len(self.user_headers))
+        return "POST /auth/login-json", await self.client.post("/auth/login-json", json={"email": bench_email(i), "password": BENCH_PASSWORD})
+
+    async def checkout(self):
+        lines = [{"item_id": item_id, "quantity": 1} for item_id in self.rnd.sample(self.item_ids, 2)]
+        r = await self.client.post("/orders", json={"items": lines}, headers=self.rnd.choice(self.user_headers))
+        if r.status_code == 200:
+            self.pending_orders.append(r.json()["id"])
+        return "POST /orders", r
+
+    async def my_orders(self):
+        return "GET /orders/me", await self.client.get("/orders/me", params={"limit": 20}, headers=self.rnd.choice(self.user_headers))
+
+    async def approve(self):
+        if not self.pending_orders:
+            return await self.checkout()
+        order_id = self.pending_orders.pop(self.rnd.randrange(len(self.pending_orders)))
+        return "POST /orders/{id}/approve", await self.client.post(f"/orders/{order_id}/approve", headers=self.admin_headers)
+
+    async def admin_orders(self):
+        return "GET /orders", await self.client.get("/orders", params={"limit": 100, "status": "pending"}, headers=self.admin_headers)
+
+    def mix(self):
+        return [
+            (self.browse_items, 30),
+            (self.item_detail, 20),
+            (self.search, 10),
+            (self.categories, 5),
+            (self.login, self.args.login_weight),
+            (self.checkout, 10),
+            (self.my_orders, 10),
+            (self.approve, 5),
+            (self.admin_orders, 5),
+        ]
+
+async def client_loop(workload: Workload, recorder: Recorder, deadline: float, rnd: random.Random) -> None:
+    ops, weights = zip(*workload.mix())
+    while time.perf_counter() < deadline:
+        op = rnd.choices(ops, weights)[0]
+        start = time.perf_counter()
+        try:
+            name, response = await op()
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            name, ok = op.__name__, False
+        recorder.record(name, time.perf_counter() - start, ok)
+
+async def run(args) -> dict:
+    async with AsyncExitStack() as stack:
+        if args.url:
+            transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=args.concurrency))
+            base_url = args.url
+        else:
+            from app.main import app
+
+            # em processo: mesmo app, mesmo threadpool e mesmo event loop, sem rede
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            transport = httpx.ASGITransport(app=app)
+            base_url = "http://bench"
+        client = await stack.enter_async_context(httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60))
+
+        rnd = random.Random(args.seed)
+        workload = Workload(client, args, rnd)
+        await workload.prepare()
+
+        recorder = Recorder()
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(
+            client_loop(workload, recorder, deadline, random.Random(args.seed + i)) for i in range(args.concurrency)
+        ))
+        result = summarize(recorder, time.perf_counter() - start)
+
+    result["meta"] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "mode": "http" if args.url else "inprocess",
+        "url": args.url,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "database_url": None if args.url else os.environ.get("DATABASE_URL"),
+    }
+    return result
+
+def print_report(result: dict) -> None:
+    print(f"{'rota':<28}{'n':>7}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, r in result["routes"].items():
+        print(f"{name:<28}{r['count']:>7}{r['errors']:>6}{r['rps']:>9.1f}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}")
+    total = result["total"]
+    print(f"total: {total['requests']} requisições em {total['seconds']:.1f}s ({total['rps']:.1f} req/s)")
+
+def compare(result: dict, baseline: dict, max_regression: float | None) -> bool:
+    ok = True
+    print(f"\n{'rota':<28}{'p50 antes':>11}{'p50 agora':>11}{'p99 antes':>11}{'p99 agora':>11}{'Δp99':>9}")
+    for name, r in result["routes"].items():
+        old = baseline["routes"].get(name)
+        if not old:
+            continue
+        delta = (r["p99_ms"] - old["p99_ms"]) / old["p99_ms"] * 100 if old["p99_ms"] else 0.0
+        flag = ""
+        if max_regression is not None and delta > max_regression:
+            ok = False
+            flag = "  <-- regressão"
+        print(f"{name:<28}{old['p50_ms']:>11.2f}{r['p50_ms']:>11.2f}{old['p99_ms']:>11.2f}{r['p99_ms']:>11.2f}{delta:>8.1f}%{flag}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga mista contra a API (em processo ou via HTTP).")
+    parser.add_argument("--url", help="servidor já rodando; sem isso o app roda em processo")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--users", type=int, default=200, help="usuários semeados pelo bench.seed")
+    parser.add_argument("--login-weight", type=int, default=5)
+    parser.add_argument("--admin-email", default=os.environ.get("ADMIN_EMAIL", "admin@example.com"))
+    parser.add_argument("--admin-password", default=os.environ.get("ADMIN_PASSWORD", "admin123"))
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="grava o resultado em JSON (baseline)")
+    parser.add_argument("--compare", help="baseline JSON anterior para comparar")
+    parser.add_argument("--max-regression", type=float, help="falha se o p99 de alguma rota piorar mais que N%%")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print_report(result)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if not compare(result, baseline, args.max_regression):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
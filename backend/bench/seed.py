@@ -0,0 +1,111 @@
+import argparse
+import os
+import random
+import time
+
+# o banco do benchmark nunca deve ser o de desenvolvimento
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+if __name__ == "__main__":
+    # custo baixo do bcrypt só ao semear (python -m bench.seed): o run.py importa este módulo e
+    # não pode herdar o custo 4. O primeiro login refaz o hash com o custo configurado
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.db.migrate import upgrade_to_head
+from app.db.session import SessionLocal
+from app.main import app  # noqa: F401  (registra modelos)
+from app.models.item import Item
+from app.models.user import User
+from app.services.category_service import create_category
+from app.services.item_import_service import upsert_items
+from app.services.order_service import create_order
+from app.services.user_service import create_user
+from app.services.version_service import ensure_versions
+
+BENCH_PASSWORD = "bench123"
+PART_NAMES = ["Resistor", "Capacitor", "LED", "Módulo", "Sensor", "Placa", "Relé", "Transistor", "Diodo", "Cabo"]
+PART_SPECS = ["220Ω", "10k", "5mm", "SMD", "DIP", "NPN", "cerâmico", "USB", "Wi-Fi", "azul"]
+
+def bench_email(i: int) -> str:
+    return f"bench{i}@example.com"
+
+def seed(*, users: int, categories: int, items: int, orders: int, lines_per_order: int, seed_value: int = 42) -> dict:
+    rnd = random.Random(seed_value)
+    upgrade_to_head()
+    db = SessionLocal()
+    timings = {}
+    try:
+        ensure_versions(db)
+
+        t = time.perf_counter()
+        existing_users = db.scalar(select(func.count()).select_from(User).where(User.email.like("bench%")))
+        for i in range(existing_users, users):
+            create_user(db, name=f"Bench {i}", email=bench_email(i), password=BENCH_PASSWORD)
+        user_ids = list(db.scalars(select(User.id).where(User.email.like("bench%"))))
+        timings["users"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        category_ids = []
+        for i in range(categories):
+            try:
+                category_ids.append(create_category(db, f"Bench {i}").id)
+            except HTTPException:
+                db.rollback()
+        if not category_ids:
+            category_ids = [1]
+        timings["categories"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        rows = (
+            (i, {
+                "name": f"{rnd.choice(PART_NAMES)} {rnd.choice(PART_SPECS)} {i}",
+                "description": f"Peça sintética {i}",
+                "stock": rnd.randint(10_000, 100_000),
+                "category_id": rnd.choice(category_ids),
+            })
+            for i in range(items)
+        )
+        upsert_items(db, rows)
+        item_ids = list(db.scalars(select(Item.id)))
+        timings["items"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        for _ in range(orders):
+            lines = [
+                {"item_id": item_id, "quantity": rnd.randint(1, 3)}
+                for item_id in rnd.sample(item_ids, min(lines_per_order, len(item_ids)))
+            ]
+            try:
+                create_order(db, user_id=rnd.choice(user_ids), items=lines)
+            except HTTPException:
+                db.rollback()
+        timings["orders"] = time.perf_counter() - t
+    finally:
+        db.close()
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Popula o banco de benchmark pela camada de serviços.")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--items", type=int, default=20_000)
+    parser.add_argument("--orders", type=int, default=5_000)
+    parser.add_argument("--lines-per-order", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    timings = seed(
+        users=args.users,
+        categories=args.categories,
+        items=args.items,
+        orders=args.orders,
+        lines_per_order=args.lines_per_order,
+        seed_value=args.seed,
+    )
+    for name, secs in timings.items():
+        print(f"{name:<12} {secs:8.2f}s")
+
+if __name__ == "__main__":
+    main()
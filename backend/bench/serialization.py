@@ -0,0 +1,81 @@
+import argparse
+import gzip
+import json
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+import brotli
+import orjson
+from pydantic import TypeAdapter
+
+from app.core.serialization import rows_to_dicts
+from app.db.session import SessionLocal
+from app.main import app  # noqa: F401  (registra modelos)
+from app.routers.orders import to_order_out
+from app.schemas.item import ItemOut
+from app.schemas.order import OrderItemOut, OrderOut
+from app.services.item_service import list_items
+from app.services.order_service import list_orders_all
+
+def best_of(fn, repeat: int) -> tuple[float, bytes]:
+    best, body = float("inf"), b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, body
+
+def report(title: str, variants: dict, repeat: int) -> None:
+    print(f"\n{title}")
+    print(f"{'caminho':<36}{'ms':>9}{'bytes':>11}{'gzip':>10}{'br':>10}")
+    for name, fn in variants.items():
+        ms, body = best_of(fn, repeat)
+        gz = len(gzip.compress(body, 6))
+        br = len(brotli.compress(body, quality=4))
+        print(f"{name:<36}{ms:>9.1f}{len(body):>11}{gz:>10}{br:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de serialização e bytes na rede para respostas grandes.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        items = list_items(db, limit=args.rows)
+        orders = list_orders_all(db, limit=args.rows)
+
+        # o que o FastAPI faz com response_model: valida cada linha, converte para JSON-compatível e faz dumps
+        items_adapter = TypeAdapter(list[ItemOut])
+        orders_adapter = TypeAdapter(list[OrderOut])
+
+        def items_model(dumps):
+            return lambda: dumps(items_adapter.dump_python(items_adapter.validate_python(items, from_attributes=True), mode="json"))
+
+        def orders_model(dumps):
+            return lambda: dumps(orders_adapter.dump_python([to_order_out(o) for o in orders], mode="json"))
+
+        def stdlib(content):
+            return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+        report(f"{len(items)} itens", {
+            "response_model + json (antes)": items_model(stdlib),
+            "response_model + orjson": items_model(orjson.dumps),
+            "rows_to_dicts + orjson (rápido)": lambda: orjson.dumps(rows_to_dicts(items, ItemOut)),
+        }, args.repeat)
+
+        report(f"{len(orders)} pedidos", {
+            "response_model + json (antes)": orders_model(stdlib),
+            "response_model + orjson": orders_model(orjson.dumps),
+            "rows_to_dicts + orjson (rápido)": lambda: orjson.dumps([
+                {"id": o.id, "user_id": o.user_id, "status": o.status, "items": rows_to_dicts(o.items, OrderItemOut)}
+                for o in orders
+            ]),
+        }, args.repeat)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.migrate import upgrade_to_head
+from app.db.session import make_engine
+from app.main import app  # noqa: F401  (registra modelos)
+from app.services.category_service import create_category
+from app.services.item_service import create_item
+from app.services.order_service import create_order
+from app.services.user_service import create_user
+from app.services.version_service import ensure_versions
+
+# "antes" = journal padrão do SQLite (DELETE/FULL); "depois" = padrões do Settings (WAL/NORMAL)
+MODES = {
+    "antes": {"SQLITE_JOURNAL_MODE": "DELETE", "SQLITE_SYNCHRONOUS": "FULL"},
+    "depois": {"SQLITE_JOURNAL_MODE": "WAL", "SQLITE_SYNCHRONOUS": "NORMAL"},
+}
+
+def run_mode(name: str, overrides: dict, *, threads: int, orders: int, workdir: str) -> dict:
+    url = f"sqlite:///{os.path.join(workdir, f'writes-{name}.db')}"
+    upgrade_to_head(url)
+    for key, value in overrides.items():
+        setattr(settings, key, value)
+    engine = make_engine(url)
+    Session = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+    with Session() as db:
+        ensure_versions(db)
+        user_id = create_user(db, name="Bench writes", email="writes@example.com", password="bench123").id
+        category_id = create_category(db, "Bench writes").id
+        # um item por thread: mede a escrita concorrente, não a disputa pelo mesmo estoque
+        item_ids = [create_item(db, name=f"Item {i}", description=None, stock=orders, category_id=category_id).id for i in range(threads)]
+
+    errors: dict[str, int] = {}
+    lock = threading.Lock()
+    start = threading.Barrier(threads + 1)
+
+    def worker(item_id: int, count: int):
+        start.wait()
+        for _ in range(count):
+            db = Session()
+            try:
+                create_order(db, user_id, [{"item_id": item_id, "quantity": 1}])
+            except Exception as e:
+                with lock:
+                    key = getattr(e, "detail", None) or str(getattr(e, "orig", e))
+                    errors[key] = errors.get(key, 0) + 1
+            finally:
+                db.close()
+
+    per_thread = orders // threads
+    pool = [threading.Thread(target=worker, args=(item_ids[i], per_thread)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    start.wait()
+    began = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - began
+    engine.dispose()
+
+    total = per_thread * threads
+    failed = sum(errors.values())
+    return {"orders": total, "failed": failed, "seconds": elapsed, "orders_per_s": (total - failed) / elapsed, "errors": errors}
+
+def main():
+    parser = argparse.ArgumentParser(description="Vazão de escrita (create_order concorrente) antes/depois dos pragmas do SQLite.")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--orders", type=int, default=480)
+    parser.add_argument("--busy-timeout-ms", type=int, default=settings.SQLITE_BUSY_TIMEOUT_MS)
+    args = parser.parse_args()
+
+    settings.SQLITE_BUSY_TIMEOUT_MS = args.busy_timeout_ms
+    with tempfile.TemporaryDirectory(prefix="electrostock-writes-") as workdir:
+        for name, overrides in MODES.items():
+            r = run_mode(name, overrides, threads=args.threads, orders=args.orders, workdir=workdir)
+            mode = "/".join(overrides.values())
+            print(f"{name} ({mode}, busy_timeout={args.busy_timeout_ms}ms): {r['orders']} pedidos em {r['seconds']:.2f}s, "
+                  f"{r['orders_per_s']:.0f} pedidos/s, {r['failed']} falhas")
+            for message, count in r["errors"].items():
+                print(f"    {count}x {message}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.session import to_sync_url
+
+from app.models.user import User  # noqa: F401
+from app.models.category import Category  # noqa: F401
+from app.models.item import Item  # noqa: F401
+from app.models.order import Order  # noqa: F401
+from app.models.order_item import OrderItem  # noqa: F401
+from app.models.table_version import TableVersion  # noqa: F401
+from app.models.order_summary import OrderStatusCount, ItemOrderStat  # noqa: F401
+from app.models.idempotency_key import IdempotencyKey  # noqa: F401
+from app.models.stock_ledger import StockMovement, StockSnapshot  # noqa: F401
+from app.models.outbox import OutboxJob  # noqa: F401
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # as tabelas internas do FTS5 (migração 0004) não existem nos modelos
+    return not (type_ == "table" and name.startswith("items_fts"))
+
+def _url():
+    # permite sobrescrever a URL (ex.: app.db.migrate.upgrade_to_head(url)); senão usa o DATABASE_URL
+    url = config.attributes.get("url") or settings.DATABASE_URL
+    return to_sync_url(make_url(url))
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=_url().render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_object=include_object,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online() -> None:
+    connectable = create_engine(_url(), poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        # render_as_batch: SQLite não tem ALTER TABLE completo, o Alembic recria a tabela
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            render_as_batch=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+    connectable.dispose()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,81 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def _missing(name: str) -> bool:
+    # bancos criados pelo antigo create_all já têm estas tabelas: a baseline só as adota
+    return not sa.inspect(op.get_bind()).has_table(name)
+
+def upgrade() -> None:
+    if _missing("users"):
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(length=120), nullable=False),
+            sa.Column("email", sa.String(length=255), nullable=False),
+            sa.Column("password_hash", sa.String(length=255), nullable=False),
+            sa.Column("role", sa.String(length=20), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if _missing("categories"):
+        op.create_table(
+            "categories",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(length=120), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("name"),
+        )
+
+    if _missing("items"):
+        op.create_table(
+            "items",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(length=160), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("stock", sa.Integer(), nullable=False),
+            sa.Column("category_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["category_id"], ["categories.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    if _missing("orders"):
+        op.create_table(
+            "orders",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("status", sa.String(length=20), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    if _missing("order_items"):
+        op.create_table(
+            "order_items",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("order_id", sa.Integer(), nullable=False),
+            sa.Column("item_id", sa.Integer(), nullable=False),
+            sa.Column("quantity", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["item_id"], ["items.id"]),
+            sa.ForeignKeyConstraint(["order_id"], ["orders.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+def downgrade() -> None:
+    op.drop_table("order_items")
+    op.drop_table("orders")
+    op.drop_table("items")
+    op.drop_table("categories")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_table("users")
@@ -0,0 +1,32 @@
+"""composite indexes for hot lookups
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# (nome, tabela, colunas): a coluna de filtro primeiro e o id no fim, para que
+# "WHERE x = ? AND id > ? ORDER BY id LIMIT n" (paginação por cursor) leia só o trecho do índice
+INDEXES = [
+    ("ix_items_category_id_id", "items", ["category_id", "id"]),
+    ("ix_items_stock", "items", ["stock"]),
+    ("ix_orders_user_id_id", "orders", ["user_id", "id"]),
+    ("ix_orders_status_id", "orders", ["status", "id"]),
+    ("ix_order_items_order_id_id", "order_items", ["order_id", "id"]),
+    ("ix_order_items_item_id_id", "order_items", ["item_id", "id"]),
+    ("ix_users_role_id", "users", ["role", "id"]),
+]
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,26 @@
+"""table versions for catalog etags
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("table_versions"):
+        return
+    op.create_table(
+        "table_versions",
+        sa.Column("name", sa.String(length=40), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+def downgrade() -> None:
+    op.drop_table("table_versions")
@@ -0,0 +1,47 @@
+"""order summary counters for dashboards
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "order_status_counts",
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("status"),
+    )
+    op.create_table(
+        "item_order_stats",
+        sa.Column("item_id", sa.Integer(), nullable=False),
+        sa.Column("requested", sa.Integer(), nullable=False),
+        sa.Column("consumed", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("item_id"),
+    )
+    op.create_index("ix_item_order_stats_requested", "item_order_stats", ["requested"])
+
+    # pedidos já existentes entram nos contadores uma única vez, aqui
+    op.execute("INSERT INTO order_status_counts (status, count) SELECT status, count(*) FROM orders GROUP BY status")
+    op.execute(
+        """
+        INSERT INTO item_order_stats (item_id, requested, consumed)
+        SELECT oi.item_id,
+               sum(oi.quantity),
+               sum(CASE WHEN o.status <> 'rejected' THEN oi.quantity ELSE 0 END)
+        FROM order_items oi JOIN orders o ON o.id = oi.order_id
+        GROUP BY oi.item_id
+        """
+    )
+
+def downgrade() -> None:
+    op.drop_index("ix_item_order_stats_requested", table_name="item_order_stats")
+    op.drop_table("item_order_stats")
+    op.drop_table("order_status_counts")
@@ -0,0 +1,24 @@
+"""item reorder threshold and low-stock partial index
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+LOW_STOCK = sa.text("stock <= reorder_threshold")
+
+def upgrade() -> None:
+    op.add_column("items", sa.Column("reorder_threshold", sa.Integer(), nullable=False, server_default="0"))
+    op.create_index("ix_items_low_stock", "items", ["id"], sqlite_where=LOW_STOCK, postgresql_where=LOW_STOCK)
+
+def downgrade() -> None:
+    op.drop_index("ix_items_low_stock", table_name="items")
+    with op.batch_alter_table("items") as batch:
+        batch.drop_column("reorder_threshold")
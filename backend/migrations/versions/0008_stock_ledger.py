@@ -0,0 +1,51 @@
+"""stock movement ledger and snapshots
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+import time
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "stock_movements",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("item_id", sa.Integer(), nullable=False),
+        sa.Column("delta", sa.Integer(), nullable=False),
+        sa.Column("stock_after", sa.Integer(), nullable=False),
+        sa.Column("reason", sa.String(length=20), nullable=False),
+        sa.Column("order_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_stock_movements_item_created", "stock_movements", ["item_id", "created_at"])
+    op.create_index("ix_stock_movements_created_at", "stock_movements", ["created_at"])
+    op.create_table(
+        "stock_snapshots",
+        sa.Column("taken_at", sa.Integer(), nullable=False),
+        sa.Column("item_id", sa.Integer(), nullable=False),
+        sa.Column("stock", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("taken_at", "item_id"),
+    )
+
+    # saldo de abertura: o razão começa com o estoque atual de cada item
+    op.execute(
+        sa.text(
+            "INSERT INTO stock_movements (item_id, delta, stock_after, reason, created_at) "
+            "SELECT id, stock, stock, 'opening', :now FROM items ORDER BY id"
+        ).bindparams(now=int(time.time()))
+    )
+
+def downgrade() -> None:
+    op.drop_table("stock_snapshots")
+    op.drop_index("ix_stock_movements_created_at", table_name="stock_movements")
+    op.drop_index("ix_stock_movements_item_created", table_name="stock_movements")
+    op.drop_table("stock_movements")
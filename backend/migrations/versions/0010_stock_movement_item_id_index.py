@@ -0,0 +1,18 @@
+"""latest stock movement per item (catalog ETag)
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index("ix_stock_movements_item_id", "stock_movements", ["item_id", "id"])
+
+def downgrade() -> None:
+    op.drop_index("ix_stock_movements_item_id", table_name="stock_movements")
@@ -5,4 +5,6 @@ cd "$(dirname "$0")"
 
 export PYTHONPATH="$(pwd)"
 
+alembic upgrade head
+
 uvicorn main:app --host 0.0.0.0 --port 8000 --reload
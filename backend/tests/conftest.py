@@ -0,0 +1,61 @@
+import os
+import tempfile
+
+# o app lê a configuração e cria o engine na importação: o banco de teste (arquivo, para que
+# threads/conexões diferentes o compartilhem de verdade) precisa estar no ambiente antes
+_db_dir = tempfile.mkdtemp(prefix="electrostock-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["JOB_WORKERS"] = "0"
+
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.migrate import upgrade_to_head
+
+upgrade_to_head()
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.main import app
+from app.services.category_service import create_category
+from app.services.item_service import create_item
+from app.services.user_service import create_user
+
+_seq = itertools.count(1)
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    r = client.post("/auth/login-json", json={"email": settings.ADMIN_EMAIL, "password": settings.ADMIN_PASSWORD})
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def make_user(db):
+    def make(role: str = "user"):
+        n = next(_seq)
+        return create_user(db, name=f"Teste {n}", email=f"teste{n}@example.com", password="123456", role=role)
+    return make
+
+@pytest.fixture
+def make_item(db):
+    category = create_category(db, f"Categoria teste {next(_seq)}")
+
+    def make(stock: int, name: str | None = None):
+        return create_item(db, name=name or f"Item teste {next(_seq)}", description=None, stock=stock, category_id=category.id)
+    return make
@@ -0,0 +1,79 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from jose import jwt
+
+from app.core.config import settings
+from app.core.hashing import HashingPool
+from app.core.security import create_access_token
+
+def test_register_login_and_change_password(client):
+    r = client.post("/auth/register", json={"name": "Auth", "email": "auth@example.com", "password": "senha123"})
+    assert r.status_code == 200
+    r = client.post("/auth/register", json={"name": "Auth", "email": "auth@example.com", "password": "senha123"})
+    assert r.status_code == 400
+
+    r = client.post("/auth/login-json", json={"email": "auth@example.com", "password": "errada"})
+    assert r.status_code == 401
+    r = client.post("/auth/login", data={"username": "auth@example.com", "password": "senha123"})
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    r = client.put("/users/me", json={"new_password": "nova1234"}, headers=headers)
+    assert r.status_code == 200
+    assert client.post("/auth/login-json", json={"email": "auth@example.com", "password": "senha123"}).status_code == 401
+    assert client.post("/auth/login-json", json={"email": "auth@example.com", "password": "nova1234"}).status_code == 200
+
+def test_hashing_pool_async_backpressure():
+    pool = HashingPool(workers=1, queue_limit=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run_async(release.wait))
+        queued = asyncio.ensure_future(pool.run_async(lambda: "ok"))
+        await asyncio.sleep(0.05)
+        try:
+            await pool.run_async(lambda: "sobra")
+            raise AssertionError("esperava 503 com a fila cheia")
+        except HTTPException as e:
+            assert e.status_code == 503
+
+        # cancelar quem ainda está na fila devolve a vaga sem executar a tarefa
+        queued.cancel()
+        await asyncio.sleep(0.05)
+        assert pool.stats()["queue_depth"] == 0
+        release.set()
+        await running
+        return await pool.run_async(lambda: "ok")
+
+    assert asyncio.run(scenario()) == "ok"
+    stats = pool.stats()
+    assert (stats["rejected"], stats["completed"], stats["queue_depth"], stats["active"]) == (1, 2, 0, 0)
+
+def test_low_stock_stream_takes_token_from_query(client, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "SSE_HEARTBEAT_SECONDS", 0.1)
+    # EventSource não manda Authorization: só ?access_token= chega ao servidor
+    assert client.get("/items/low-stock/stream").status_code == 401
+    user = make_user()
+    user_token = create_access_token(user.email, user_id=user.id, role=user.role)
+    assert client.get("/items/low-stock/stream", params={"access_token": user_token}).status_code == 403
+
+    # token que vence em instantes: o stream abre e fecha sozinho no vencimento
+    expire = datetime.now(timezone.utc) + timedelta(seconds=1)
+    admin_token = jwt.encode({"sub": settings.ADMIN_EMAIL, "exp": expire, "role": "admin"}, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+    r = client.get("/items/low-stock/stream", params={"access_token": admin_token})
+    assert r.status_code == 200
+    assert r.text.startswith("retry: 3000")
+
+def test_role_change_applies_without_new_login(client, admin_headers, make_user):
+    user = make_user()
+    headers = {"Authorization": f"Bearer {create_access_token(user.email, user_id=user.id, role=user.role)}"}
+    assert client.get("/users", headers=headers).status_code == 403
+
+    # o token ainda diz role=user, mas o papel vale pelo principal
+    assert client.put(f"/users/{user.id}", json={"role": "admin"}, headers=admin_headers).status_code == 200
+    assert client.get("/users", headers=headers).status_code == 200
+
+    assert client.put(f"/users/{user.id}", json={"role": "user"}, headers=admin_headers).status_code == 200
+    assert client.get("/users", headers=headers).status_code == 403
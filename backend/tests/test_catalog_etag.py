@@ -0,0 +1,35 @@
+from sqlalchemy import select
+
+from app.services.order_service import create_order, set_status
+from app.services.version_service import table_versions
+
+def _items_version(db) -> int:
+    return db.scalar(select(table_versions.c.version).where(table_versions.c.name == "items"))
+
+def _revalidate(client, path, etag) -> int:
+    return client.get(path, headers={"If-None-Match": etag}).status_code
+
+def test_stock_changes_do_not_touch_catalog_version(client, db, make_user, make_item):
+    user_id = make_user().id
+    other, ordered = make_item(stock=10).id, make_item(stock=10).id
+    other_etag = client.get(f"/items/{other}").headers["ETag"]
+    ordered_etag = client.get(f"/items/{ordered}").headers["ETag"]
+    list_etag = client.get("/items").headers["ETag"]
+
+    version = _items_version(db)
+    order = create_order(db, user_id, [{"item_id": ordered, "quantity": 2}])
+    set_status(db, order.id, "rejected", only_if="pending")
+    db.expire_all()
+    assert _items_version(db) == version
+
+    # o detalhe de outro item continua válido; o do item pedido e a listagem (que mostram estoque) não
+    assert _revalidate(client, f"/items/{other}", other_etag) == 304
+    assert _revalidate(client, f"/items/{ordered}", ordered_etag) == 200
+    assert _revalidate(client, "/items", list_etag) == 200
+
+def test_catalog_edit_changes_etag(client, admin_headers, make_item):
+    item_id = make_item(stock=1).id
+    etag = client.get(f"/items/{item_id}").headers["ETag"]
+    r = client.put(f"/items/{item_id}", json={"name": "Renomeado"}, headers=admin_headers)
+    assert r.status_code == 200
+    assert _revalidate(client, f"/items/{item_id}", etag) == 200
@@ -0,0 +1,24 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.db.session import make_async_engine, to_async_url
+
+def test_to_async_url_maps_sync_drivers():
+    assert to_async_url(make_url("sqlite:///./replica.db")).drivername == "sqlite+aiosqlite"
+    assert to_async_url(make_url("postgresql+psycopg2://u@h/db")).drivername == "postgresql+asyncpg"
+    assert to_async_url(make_url("sqlite+aiosqlite:///./replica.db")).drivername == "sqlite+aiosqlite"
+
+def test_async_engine_accepts_sync_replica_url(tmp_path):
+    # READ_REPLICA_URL=sqlite:///... com DATABASE_URL async: o engine de leitura usa o aiosqlite
+    engine = make_async_engine(f"sqlite:///{tmp_path}/replica.db", read_only=True)
+
+    async def query():
+        async with engine.connect() as conn:
+            value = await conn.scalar(text("SELECT 1"))
+        await engine.dispose()
+        return value
+
+    assert engine.url.drivername == "sqlite+aiosqlite"
+    assert asyncio.run(query()) == 1
@@ -0,0 +1,39 @@
+from sqlalchemy import func, select
+
+from app.main import app
+from app.models.item import Item
+from app.services.category_service import create_category
+
+def _items_in(db, category_id: int) -> int:
+    return db.scalar(select(func.count()).select_from(Item).where(Item.category_id == category_id))
+
+def test_bulk_reports_bad_rows_and_documents_schema(client, admin_headers, db):
+    category_id = create_category(db, "Bulk").id
+    rows = [
+        {"name": "Ok", "description": None, "stock": 1, "category_id": category_id},
+        {"name": "Sem estoque", "category_id": category_id},
+        {"name": "Categoria", "description": None, "stock": 1, "category_id": 999_999},
+    ]
+    r = client.post("/items/bulk", json=rows, headers=admin_headers)
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["inserted"], body["failed"]) == (1, 2)
+    assert [e["row"] for e in body["errors"]] == [1, 2]
+
+    schema = app.openapi()["paths"]["/items/bulk"]["post"]["requestBody"]["content"]["application/json"]["schema"]
+    assert {"$ref": "#/components/schemas/ItemUpsert"} in schema["items"]["anyOf"]
+
+def test_import_with_invalid_utf8_writes_nothing(client, admin_headers, db):
+    category_id = create_category(db, "Import").id
+    # mais linhas que um lote de import: sem a checagem prévia o primeiro lote já estaria commitado
+    lines = ["name,description,stock,category_id"]
+    lines += [f"Peça {i},,1,{category_id}" for i in range(1500)]
+    data = ("\n".join(lines) + "\n").encode() + b"Quebrada \xff,,1," + str(category_id).encode() + b"\n"
+
+    r = client.post("/items/import", files={"file": ("itens.csv", data, "text/csv")}, headers=admin_headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Arquivo precisa estar em UTF-8 (linha 1502)."
+    assert _items_in(db, category_id) == 0
+
+    r = client.post("/items/import", files={"file": ("itens.csv", data.replace(b"\xff", b""), "text/csv")}, headers=admin_headers)
+    assert r.json()["inserted"] == 1501
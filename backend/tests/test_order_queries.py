@@ -0,0 +1,33 @@
+from sqlalchemy import event
+
+from app.db.session import engine
+from app.services.order_service import create_order
+
+def _count_queries(client, headers, params) -> tuple[int, int]:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        r = client.get("/orders", params=params, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert r.status_code == 200
+    return len(statements), len(r.json())
+
+def test_list_orders_query_count_is_constant(client, admin_headers, db, make_user, make_item):
+    items = [make_item(stock=1000).id for _ in range(3)]
+    lines = [{"item_id": item_id, "quantity": 1} for item_id in items]
+    one, many = make_user(), make_user()
+    create_order(db, one.id, lines)
+    for _ in range(50):
+        create_order(db, many.id, lines)
+
+    # a primeira requisição também carrega o admin (depois vem do cache): fica fora da medição
+    client.get("/orders", params={"user_id": one.id}, headers=admin_headers)
+    queries_one, rows_one = _count_queries(client, admin_headers, {"user_id": one.id})
+    queries_many, rows_many = _count_queries(client, admin_headers, {"user_id": many.id})
+    assert (rows_one, rows_many) == (1, 50)
+    assert queries_many == queries_one
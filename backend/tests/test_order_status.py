@@ -0,0 +1,112 @@
+import threading
+
+from fastapi import HTTPException
+
+from app.db.session import SessionLocal
+from app.models.item import Item
+from app.models.order import Order
+from app.models.order_summary import OrderStatusCount
+from app.services.order_item_service import delete_order_item
+from app.services.order_service import create_order, delete_order, set_status
+
+CALLERS = 8
+
+def _status_counts(db) -> dict[str, int]:
+    return {row.status: row.count for row in db.query(OrderStatusCount)}
+
+def test_concurrent_rejects_release_stock_once(db, make_user, make_item):
+    user_id = make_user().id
+    item_id = make_item(stock=5).id
+    order_id = create_order(db, user_id, [{"item_id": item_id, "quantity": 1}]).id
+    counts_before = _status_counts(db)
+    db.close()
+
+    results: list[str] = []
+    lock = threading.Lock()
+    start = threading.Barrier(CALLERS)
+
+    def reject():
+        session = SessionLocal()
+        try:
+            start.wait()
+            set_status(session, order_id, "rejected", only_if="pending")
+            outcome = "ok"
+        except HTTPException as e:
+            outcome = f"http {e.status_code}"
+        finally:
+            session.close()
+        with lock:
+            results.append(outcome)
+
+    threads = [threading.Thread(target=reject) for _ in range(CALLERS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results.count("ok") == 1
+    assert results.count("http 400") == CALLERS - 1
+    with SessionLocal() as check:
+        assert check.get(Item, item_id).stock == 5
+        counts = _status_counts(check)
+    assert counts["pending"] == counts_before["pending"] - 1
+    assert counts["rejected"] == counts_before.get("rejected", 0) + 1
+
+def _race(*calls) -> list[str]:
+    results = [""] * len(calls)
+    start = threading.Barrier(len(calls))
+
+    def run(index, call):
+        session = SessionLocal()
+        try:
+            start.wait()
+            call(session)
+            outcome = "ok"
+        except HTTPException as e:
+            outcome = f"http {e.status_code}"
+        finally:
+            session.close()
+        results[index] = outcome
+
+    threads = [threading.Thread(target=run, args=pair) for pair in enumerate(calls)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+def test_removals_racing_approve_keep_stock_and_counters(db, make_user, make_item):
+    user_id = make_user().id
+    item_ids = [make_item(stock=10).id for _ in range(10)]
+    db.close()
+
+    for item_id in item_ids:
+        with SessionLocal() as setup:
+            before = _status_counts(setup)
+            order = create_order(setup, user_id, [{"item_id": item_id, "quantity": 2}])
+            order_id, line_id = order.id, order.items[0].id
+        results = _race(
+            lambda s: set_status(s, order_id, "approved", only_if="pending"),
+            lambda s: delete_order(s, order_id),
+            lambda s: delete_order_item(s, line_id),
+        )
+        approve, delete, remove_line = results
+        # exatamente um entre aprovar e excluir vence; quem perde vê o pedido já fora de
+        # pendente (400) ou já excluído (404); a linha só sai antes da aprovação
+        assert [approve, delete].count("ok") == 1
+        assert {approve, delete} - {"ok"} <= {"http 400", "http 404"}
+        assert remove_line in {"ok", "http 400", "http 404"}
+
+        with SessionLocal() as check:
+            order = check.get(Order, order_id)
+            status = order.status if order else None
+            reserved = sum(line.quantity for line in order.items) if order else 0
+            assert check.get(Item, item_id).stock == 10 - reserved
+            counts = _status_counts(check)
+        if approve == "ok":
+            assert status == "approved"
+            assert counts["approved"] == before.get("approved", 0) + 1
+        else:
+            assert order is None
+        # o pedido entrou como pendente e saiu (aprovado ou excluído) exatamente uma vez
+        assert counts["pending"] == before.get("pending", 0)
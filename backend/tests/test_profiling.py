@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.profiling import ProfilingMiddleware, StackSampler, query_origin
+from app.db.reads import fetch_scalar
+
+def _spin(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+def request_work() -> None:
+    _spin(0.3)
+
+def unrelated_work(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+def test_sampler_only_sees_the_profiled_request():
+    async def request():
+        with StackSampler(0.005) as sampler:
+            await run_in_threadpool(request_work)
+            _spin(0.1)
+        return sampler
+
+    stop = threading.Event()
+    other = threading.Thread(target=unrelated_work, args=(stop,))
+    other.start()
+    try:
+        sampler = asyncio.run(request())
+    finally:
+        stop.set()
+        other.join()
+
+    frames = {name for stack in sampler.samples for name in stack.split(";")}
+    assert "test_profiling.request_work" in frames
+    assert "test_profiling.request" in frames
+    assert "test_profiling.unrelated_work" not in frames
+
+def test_read_helpers_reset_query_origin(db, monkeypatch):
+    monkeypatch.setattr(settings, "SQL_PROFILING_ENABLED", True)
+
+    async def scenario():
+        await fetch_scalar(db, select(1))
+        return query_origin.get()
+
+    assert asyncio.run(scenario()) is None
+
+def test_x_profile_needs_the_configured_secret(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_DUMP_DIR", str(tmp_path))
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+    app.get("/ping")(lambda: {"ok": True})
+    client = TestClient(app)
+
+    # sem segredo configurado, ninguém liga o amostrador
+    monkeypatch.setattr(settings, "PROFILE_SECRET", None)
+    assert "x-profile-dump" not in client.get("/ping", headers={"X-Profile": "1"}).headers
+
+    monkeypatch.setattr(settings, "PROFILE_SECRET", "s3cret")
+    assert "x-profile-dump" not in client.get("/ping", headers={"X-Profile": "1"}).headers
+    assert list(tmp_path.iterdir()) == []
+
+    r = client.get("/ping", headers={"X-Profile": "s3cret"})
+    assert (tmp_path / r.headers["x-profile-dump"]).exists()
@@ -0,0 +1,99 @@
+import asyncio
+import fnmatch
+import time
+
+import pytest
+
+from app.core.cache import RedisCache, TTLCache
+from app.db.session import SessionLocal
+from app.services import item_service
+from app.services.item_service import get_item_async, update_item
+from app.services.record_cache_service import item_cache
+
+# subconjunto dos comandos do redis-py usados pelo RedisCache (valores em bytes, como o cliente real)
+class FakeRedis:
+    def __init__(self):
+        self._data: dict[str, tuple[bytes, float | None]] = {}
+
+    def _live(self, key):
+        entry = self._data.get(key)
+        if entry and entry[1] is not None and entry[1] < time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key):
+        entry = self._live(key)
+        return entry[0] if entry else None
+
+    def set(self, key, value, ex=None):
+        raw = value if isinstance(value, bytes) else str(value).encode()
+        self._data[key] = (raw, time.monotonic() + ex if ex else None)
+
+    def delete(self, *keys):
+        return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def incr(self, key):
+        entry = self._live(key)
+        value = int(entry[0]) + 1 if entry else 1
+        self._data[key] = (str(value).encode(), entry[1] if entry else None)
+        return value
+
+    def expire(self, key, seconds):
+        entry = self._live(key)
+        if entry:
+            self._data[key] = (entry[0], time.monotonic() + seconds)
+
+    def scan_iter(self, pattern):
+        return [key for key in list(self._data) if fnmatch.fnmatchcase(key, pattern)]
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    if request.param == "memory":
+        return TTLCache(100, 30)
+    return RedisCache("redis://stand-in", "test", 30, client=FakeRedis())
+
+def test_set_after_invalidation_is_refused(cache):
+    generation = cache.generation(1)
+    cache.delete(1)
+    cache.set(1, {"stock": 5}, generation)
+    assert cache.get(1) is None
+    assert cache.stats()["stale_sets"] == 1
+
+    generation = cache.generation(1)
+    cache.set(1, {"stock": 4}, generation)
+    assert cache.get(1) == {"stock": 4}
+
+def test_invalidation_of_other_key_keeps_set(cache):
+    generation = cache.generation(1)
+    cache.delete(2)
+    cache.set(1, {"stock": 5}, generation)
+    assert cache.get(1) == {"stock": 5}
+
+def test_memory_cache_refuses_when_invalidation_log_overflows():
+    cache = TTLCache(2, 30)
+    generation = cache.generation(1)
+    for key in (2, 3, 4):
+        cache.delete(key)
+    # o registro só guarda 2 chaves: sem saber se "1" mudou, recusa
+    cache.set(1, "velho", generation)
+    assert cache.get(1) is None
+
+def test_reader_racing_a_commit_does_not_cache_stale_item(db, make_item, monkeypatch):
+    item_id = make_item(stock=10).id
+    item_cache.delete(item_id)
+    original_fetch = item_service.fetch_by_id
+
+    async def fetch_then_commit_update(*args, **kwargs):
+        # o leitor já tem o estoque antigo em mãos quando a escrita commita e invalida
+        item = await original_fetch(*args, **kwargs)
+        with SessionLocal() as writer:
+            update_item(writer, item_id, name=None, description=None, stock=3, category_id=None)
+        return item
+
+    monkeypatch.setattr(item_service, "fetch_by_id", fetch_then_commit_update)
+    assert asyncio.run(get_item_async(db, item_id))["stock"] == 10
+    monkeypatch.undo()
+
+    db.expire_all()
+    assert asyncio.run(get_item_async(db, item_id))["stock"] == 3
@@ -0,0 +1,48 @@
+import threading
+
+from fastapi import HTTPException
+
+from app.db.session import SessionLocal
+from app.models.item import Item
+from app.services.order_service import create_order
+
+THREADS = 30
+STOCK = 10
+
+def test_concurrent_orders_never_oversell(make_user, make_item):
+    user_id = make_user().id
+    item_id = make_item(stock=STOCK).id
+
+    results: list[str] = []
+    lock = threading.Lock()
+    start = threading.Barrier(THREADS)
+
+    def order():
+        db = SessionLocal()
+        try:
+            start.wait()
+            create_order(db, user_id, [{"item_id": item_id, "quantity": 1}])
+            outcome = "ok"
+        except HTTPException as e:
+            outcome = f"http {e.status_code}"
+        finally:
+            db.close()
+        with lock:
+            results.append(outcome)
+
+    threads = [threading.Thread(target=order) for _ in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    with SessionLocal() as db:
+        final_stock = db.get(Item, item_id).stock
+
+    # com mais pedidos que estoque, o estoque inteiro tem de ser vendido: menos sucessos
+    # significa pedido perdido por erro (ex.: "database is locked"), não só venda a mais
+    assert len(results) == THREADS
+    assert set(results) <= {"ok", "http 400"}
+    assert results.count("ok") == STOCK
+    assert results.count("http 400") == THREADS - STOCK
+    assert final_stock == 0
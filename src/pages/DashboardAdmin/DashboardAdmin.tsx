@@ -26,6 +26,83 @@ function authHeaders() {
   return token ? { Authorization: `Bearer ${token}` } : {};
 }
 
+// listas da API são paginadas por cursor: segue o X-Next-Cursor até a última página
+const PAGE_SIZE = 1000;
+
+async function fetchAllPages<T>(path: string): Promise<{ ok: true; data: T[] } | { ok: false; error: ApiError }> {
+  const rows: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const query: string = `limit=${PAGE_SIZE}` + (cursor ? `&cursor=${encodeURIComponent(cursor)}` : "");
+    const resp: Response = await fetch(`${API_URL}${path}?${query}`, { headers: { ...authHeaders() } });
+    const data = (await resp.json().catch(() => [])) as T[] | ApiError;
+    if (!resp.ok) return { ok: false, error: data as ApiError };
+    rows.push(...(data as T[]));
+    cursor = resp.headers.get("X-Next-Cursor");
+  } while (cursor);
+  return { ok: true, data: rows };
+}
+
+type OrderEvent =
+  | { type: "created"; order: Order }
+  | { type: "status"; order_id: number; status: Status }
+  | { type: "deleted"; order_id: number };
+
+// deltas enviados pelo servidor (SSE) aplicados à lista já carregada
+function applyOrderEvent(prev: Order[], ev: OrderEvent): Order[] {
+  if (ev.type === "created") {
+    return prev.some((o) => o.id === ev.order.id) ? prev : [...prev, ev.order];
+  }
+  if (ev.type === "status") {
+    return prev.map((o) => (o.id === ev.order_id ? { ...o, status: ev.status } : o));
+  }
+  return prev.filter((o) => o.id !== ev.order_id);
+}
+
+// exp do JWT (segundos); o front não valida assinatura, só evita reconectar com token vencido
+function tokenExpired(token: string) {
+  try {
+    const payload = JSON.parse(atob(token.split(".")[1].replace(/-/g, "+").replace(/_/g, "/")));
+    return typeof payload.exp === "number" && payload.exp * 1000 <= Date.now();
+  } catch {
+    return true;
+  }
+}
+
+function subscribeOrders(path: string, onEvent: (ev: OrderEvent) => void, onExpired: () => void) {
+  const listener = (e: MessageEvent) => onEvent(JSON.parse(e.data) as OrderEvent);
+  let source: EventSource | null = null;
+  let retry: number | undefined;
+
+  function open() {
+    const token = getToken();
+    if (!token || tokenExpired(token)) {
+      onExpired();
+      return;
+    }
+    // EventSource não envia Authorization: o token vai na query
+    const current = new EventSource(`${API_URL}${path}?access_token=${encodeURIComponent(token)}`);
+    for (const type of ["created", "status", "deleted"]) current.addEventListener(type, listener);
+    current.onerror = () => {
+      // quando o token vence o servidor fecha o stream; a reconexão automática usaria a mesma URL
+      // (401) e o EventSource desistiria calado. Reabre com o token atual ou manda para o login
+      if (tokenExpired(token)) {
+        current.close();
+        open();
+      } else if (current.readyState === EventSource.CLOSED) {
+        retry = window.setTimeout(open, 5000);
+      }
+    };
+    source = current;
+  }
+
+  open();
+  return () => {
+    window.clearTimeout(retry);
+    source?.close();
+  };
+}
+
 export default function DashboardAdmin() {
   const navigate = useNavigate();
 
@@ -65,25 +142,22 @@ export default function DashboardAdmin() {
     async function load() {
       setError("");
       try {
-        const [itResp, odResp] = await Promise.all([
-          fetch(`${API_URL}/items`, { headers: { ...authHeaders() } }),
-          fetch(`${API_URL}/orders`, { headers: { ...authHeaders() } }),
+        const [itResult, odResult] = await Promise.all([
+          fetchAllPages<Item>("/items"),
+          fetchAllPages<Order>("/orders"),
         ]);
 
-        const itData = (await itResp.json().catch(() => [])) as Item[] | ApiError;
-        const odData = (await odResp.json().catch(() => [])) as Order[] | ApiError;
-
-        if (!itResp.ok) {
-          setError((itData as ApiError).detail ?? "Erro ao carregar itens.");
+        if (!itResult.ok) {
+          setError(itResult.error.detail ?? "Erro ao carregar itens.");
           return;
         }
-        if (!odResp.ok) {
-          setError((odData as ApiError).detail ?? "Erro ao carregar pedidos.");
+        if (!odResult.ok) {
+          setError(odResult.error.detail ?? "Erro ao carregar pedidos.");
           return;
         }
 
-        setItems(itData as Item[]);
-        setOrders(odData as Order[]);
+        setItems(itResult.data);
+        setOrders(odResult.data);
       } catch {
         setError("Erro ao carregar dados.");
       }
@@ -91,6 +165,11 @@ export default function DashboardAdmin() {
     load();
   }, []);
 
+  useEffect(() => {
+    if (!getToken()) return;
+    return subscribeOrders("/orders/stream", (ev) => setOrders((prev) => applyOrderEvent(prev, ev)), logout);
+  }, []);
+
   const getItemName = (id: number) =>
     items.find((i) => i.id === id)?.name ?? `Item #${id}`;
 
@@ -49,6 +49,83 @@ function authHeaders() {
   return token ? { Authorization: `Bearer ${token}` } : {};
 }
 
+// listas da API são paginadas por cursor: segue o X-Next-Cursor até a última página
+const PAGE_SIZE = 1000;
+
+async function fetchAllPages<T>(path: string): Promise<{ ok: true; data: T[] } | { ok: false; error: ApiError }> {
+  const rows: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const query: string = `limit=${PAGE_SIZE}` + (cursor ? `&cursor=${encodeURIComponent(cursor)}` : "");
+    const resp: Response = await fetch(`${API_URL}${path}?${query}`, { headers: { ...authHeaders() } });
+    const data = (await resp.json().catch(() => [])) as T[] | ApiError;
+    if (!resp.ok) return { ok: false, error: data as ApiError };
+    rows.push(...(data as T[]));
+    cursor = resp.headers.get("X-Next-Cursor");
+  } while (cursor);
+  return { ok: true, data: rows };
+}
+
+type OrderEvent =
+  | { type: "created"; order: Order }
+  | { type: "status"; order_id: number; status: Status }
+  | { type: "deleted"; order_id: number };
+
+// deltas enviados pelo servidor (SSE) aplicados à lista já carregada
+function applyOrderEvent(prev: Order[], ev: OrderEvent): Order[] {
+  if (ev.type === "created") {
+    return prev.some((o) => o.id === ev.order.id) ? prev : [...prev, ev.order];
+  }
+  if (ev.type === "status") {
+    return prev.map((o) => (o.id === ev.order_id ? { ...o, status: ev.status } : o));
+  }
+  return prev.filter((o) => o.id !== ev.order_id);
+}
+
+// exp do JWT (segundos); o front não valida assinatura, só evita reconectar com token vencido
+function tokenExpired(token: string) {
+  try {
+    const payload = JSON.parse(atob(token.split(".")[1].replace(/-/g, "+").replace(/_/g, "/")));
+    return typeof payload.exp === "number" && payload.exp * 1000 <= Date.now();
+  } catch {
+    return true;
+  }
+}
+
+function subscribeOrders(path: string, onEvent: (ev: OrderEvent) => void, onExpired: () => void) {
+  const listener = (e: MessageEvent) => onEvent(JSON.parse(e.data) as OrderEvent);
+  let source: EventSource | null = null;
+  let retry: number | undefined;
+
+  function open() {
+    const token = getToken();
+    if (!token || tokenExpired(token)) {
+      onExpired();
+      return;
+    }
+    // EventSource não envia Authorization: o token vai na query
+    const current = new EventSource(`${API_URL}${path}?access_token=${encodeURIComponent(token)}`);
+    for (const type of ["created", "status", "deleted"]) current.addEventListener(type, listener);
+    current.onerror = () => {
+      // quando o token vence o servidor fecha o stream; a reconexão automática usaria a mesma URL
+      // (401) e o EventSource desistiria calado. Reabre com o token atual ou manda para o login
+      if (tokenExpired(token)) {
+        current.close();
+        open();
+      } else if (current.readyState === EventSource.CLOSED) {
+        retry = window.setTimeout(open, 5000);
+      }
+    };
+    source = current;
+  }
+
+  open();
+  return () => {
+    window.clearTimeout(retry);
+    source?.close();
+  };
+}
+
 export default function Dashboard() {
   const navigate = useNavigate();
 
@@ -146,18 +223,14 @@ export default function Dashboard() {
         setLoadingItems(true);
         setError("");
 
-        const resp = await fetch(`${API_URL}/items`, {
-          headers: { ...authHeaders() },
-        });
-
-        const data = (await resp.json().catch(() => [])) as Item[] | ApiError;
+        const result = await fetchAllPages<Item>("/items");
 
-        if (!resp.ok) {
-          setError((data as ApiError).detail ?? "Não foi possível carregar os itens do almoxarifado.");
+        if (!result.ok) {
+          setError(result.error.detail ?? "Não foi possível carregar os itens do almoxarifado.");
           return;
         }
 
-        setItems(data as Item[]);
+        setItems(result.data);
       } catch {
         setError("Não foi possível carregar os itens do almoxarifado.");
       } finally {
@@ -174,18 +247,14 @@ export default function Dashboard() {
       setLoadingOrdersList(true);
       setError("");
 
-      const resp = await fetch(`${API_URL}/orders/me`, {
-        headers: { ...authHeaders() },
-      });
-
-      const data = (await resp.json().catch(() => [])) as Order[] | ApiError;
+      const result = await fetchAllPages<Order>("/orders/me");
 
-      if (!resp.ok) {
-        setError((data as ApiError).detail ?? "Não foi possível carregar seus pedidos.");
+      if (!result.ok) {
+        setError(result.error.detail ?? "Não foi possível carregar seus pedidos.");
         return;
       }
 
-      setOrders(data as Order[]);
+      setOrders(result.data);
 
     } catch {
       setError("Não foi possível carregar seus pedidos.");
@@ -198,6 +267,11 @@ export default function Dashboard() {
     if (section === "myOrders") fetchOrders();
   }, [section, currentUser]);
 
+  useEffect(() => {
+    if (!currentUser) return;
+    return subscribeOrders("/orders/me/stream", (ev) => setOrders((prev) => applyOrderEvent(prev, ev)), logout);
+  }, [currentUser]);
+
   function addToCart(item: Item) {
     setError("");
     setSuccess("");